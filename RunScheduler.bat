@@ -0,0 +1,33 @@
+@echo off
+setlocal
+cd /d "%~dp0"
+
+echo ===================================================
+echo AI News Hub - Curation Scheduler
+echo ===================================================
+echo.
+echo Keeps the curated feed fresh in the background.
+echo Each feed is polled on its own cadence and only the
+echo categories with new stories are re-curated.
+echo While this window is open, page views never scrape.
+echo Press Ctrl+C to stop.
+echo.
+
+if not exist ".venv" (
+    echo [ERROR] Virtual environment not found. Please run StartMobileApp.bat first to initialize.
+    pause
+    exit /b
+)
+
+call .venv\Scripts\activate.bat
+
+call python lazy_deps.py bundle-nltk
+if errorlevel 1 (
+    echo [ERROR] NLTK data could not be downloaded. Check the network and run this again.
+    pause
+    exit /b 1
+)
+
+python generate_curation.py schedule
+
+pause
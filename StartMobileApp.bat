@@ -32,7 +32,14 @@ if errorlevel 1 (
     exit /b 1
 )
 
-:: 4. Start the application
+:: 4. Bundle the NLTK data used by the curation engine (only missing resources are downloaded)
+echo [INFO] Checking NLTK data...
+call python lazy_deps.py bundle-nltk
+if errorlevel 1 (
+    echo [WARN] NLTK data could not be downloaded. Curation will fail until "python lazy_deps.py bundle-nltk" succeeds.
+)
+
+:: 5. Start the application
 echo.
 echo [INFO] Starting the Streamlit application...
 call python -m streamlit run main.py
@@ -0,0 +1,56 @@
+import json
+import os
+import time
+
+# Persistent store of already-enriched articles keyed by their stable id
+# (md5 of the link), so incremental runs can skip download/extract/translate
+# for candidates that were processed before.
+# Degraded articles (title / lead left untranslated) are never kept, so a later run
+# with a working translator enriches them again; articles without content are kept
+# but enriched again once their retry_after has passed.
+STORE_PATH = os.path.join("data", "article_store.json")
+SNAPSHOT_PATH = os.path.join("data", "daily_curation.json")
+
+# Keep a week of history; older stories never make the top 5 again anyway
+MAX_AGE_SECONDS = 7 * 24 * 3600
+MAX_ARTICLES = 1000
+# Seconds before an article without content is downloaded again
+RETRY_AFTER = 2 * 3600
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def load_store():
+    store = _read_json(STORE_PATH, {})
+    if not isinstance(store, dict):
+        store = {}
+
+    # Seed from the last published snapshot (e.g. first run after upgrading)
+    for article in _read_json(SNAPSHOT_PATH, []):
+        if isinstance(article, dict) and article.get("id") and reusable(article):
+            store.setdefault(article["id"], article)
+    return store
+
+def reusable(article):
+    return not article.get("degraded") and article.get("retry_after", float("inf")) > time.time()
+
+def remember(store, articles):
+    for article in articles:
+        if not article.get("degraded"):
+            store[article["id"]] = article
+
+def save_store(store):
+    cutoff = time.time() - MAX_AGE_SECONDS
+    recent = [a for a in store.values() if a.get("timestamp", 0) >= cutoff]
+    recent.sort(key=lambda a: a.get("timestamp", 0), reverse=True)
+    pruned = {a["id"]: a for a in recent[:MAX_ARTICLES]}
+
+    os.makedirs(os.path.dirname(STORE_PATH), exist_ok=True)
+    tmp_path = STORE_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(pruned, f, ensure_ascii=False)
+    os.replace(tmp_path, STORE_PATH)
@@ -0,0 +1,103 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import summarizer
+from nlp_engine import get_engine
+
+# Compares summarizer.summarize_batch with the previous per-article sumy path
+# (PlaintextParser + LsaSummarizer + Lead-1 hybrid): CPU time per article and how
+# often both pick the same sentences.
+#   python benchmarks/bench_summarizer.py [--articles 60] [--sentences 80] [--corpus DIR]
+# --corpus reads *.txt files (one cleaned article each) instead of synthetic text.
+
+TOPICS = [
+    "model training data compute cluster benchmark accuracy parameters inference latency",
+    "startup funding round investors valuation revenue market growth customers enterprise",
+    "chip wafer foundry transistor memory bandwidth power efficiency design node",
+    "policy regulation safety privacy law government agency compliance risk audit",
+    "robot sensor vision control motion warehouse autonomy navigation hardware battery",
+]
+FILLER = "the a of and to in for on with that this is was are as by from it its has have will can".split()
+
+def _pseudo_words(rng, n):
+    letters = "abcdefghiklmnoprstuvwy"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(n)]
+
+def synthetic_article(rng, n_sentences):
+    # Topic words plus a long tail of rare terms, so the vocabulary grows like a real article's
+    main, side = [topic.split() + _pseudo_words(rng, 300) for topic in rng.sample(TOPICS, 2)]
+    sentences = []
+    for _ in range(n_sentences):
+        words = main if rng.random() < 0.7 else side
+        length = rng.randint(8, 24)
+        tokens = [rng.choice(words) if rng.random() < 0.5 else rng.choice(FILLER) for _ in range(length)]
+        sentences.append(" ".join(tokens).capitalize() + ".")
+    # A few lines per paragraph, like trafilatura output after cleaning
+    return "\n".join(" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4))
+
+def load_corpus(args):
+    if args.corpus:
+        texts = []
+        for name in sorted(os.listdir(args.corpus)):
+            if name.endswith(".txt"):
+                with open(os.path.join(args.corpus, name), 'r', encoding='utf-8') as f:
+                    texts.append(f.read())
+        return texts
+    rng = random.Random(args.seed)
+    return [synthetic_article(rng, args.sentences) for _ in range(args.articles)]
+
+def sumy_summary(text, lang, sentences_count):
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.summarizers.lsa import LsaSummarizer
+
+    parser = PlaintextParser.from_string(text, get_engine().tokenizer(lang))
+    sentences = list(parser.document.sentences)
+    if not sentences:
+        return []
+    first_sentence = str(sentences[0])
+    final_sentences = [first_sentence]
+    for s in LsaSummarizer()(parser.document, sentences_count):
+        if str(s) != first_sentence and len(final_sentences) < sentences_count:
+            final_sentences.append(str(s))
+    return final_sentences
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--articles", type=int, default=60)
+    ap.add_argument("--sentences", type=int, default=80, help="sentences per synthetic article")
+    ap.add_argument("--count", type=int, default=3, help="summary sentences")
+    ap.add_argument("--dimensions", type=int, default=summarizer.LSA_DIMENSIONS, help="truncated LSA topics (default: all, like sumy)")
+    ap.add_argument("--corpus")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    texts = load_corpus(args)
+    docs = [(text, "english") for text in texts]
+    summarizer.LSA_DIMENSIONS = args.dimensions
+    get_engine().warm(("english",))
+    summarizer.summarize_batch(docs[:1], args.count)
+
+    start = time.process_time()
+    baseline = [sumy_summary(text, lang, args.count) for text, lang in docs]
+    sumy_cpu = time.process_time() - start
+
+    start = time.process_time()
+    batched = summarizer.summarize_batch(docs, args.count)
+    batch_cpu = time.process_time() - start
+
+    identical = sum(1 for a, b in zip(baseline, batched) if a == b)
+    overlap = sum(len(set(a) & set(b)) / max(1, len(set(a) | set(b))) for a, b in zip(baseline, batched)) / max(1, len(docs))
+
+    n = max(1, len(docs))
+    print(f"articles: {len(docs)}  summary sentences: {args.count}  LSA dimensions: {args.dimensions or 'all'}")
+    print(f"sumy LsaSummarizer : {sumy_cpu / n * 1000:8.2f} ms CPU / article")
+    print(f"summarize_batch    : {batch_cpu / n * 1000:8.2f} ms CPU / article  ({sumy_cpu / max(batch_cpu, 1e-9):.1f}x)")
+    print(f"identical summaries: {identical}/{len(docs)}  mean sentence overlap (Jaccard): {overlap:.3f}")
+
+if __name__ == "__main__":
+    main()
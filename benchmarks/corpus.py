@@ -0,0 +1,258 @@
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from urllib.parse import urlsplit, parse_qs
+from xml.sax.saxutils import escape
+
+# Synthetic, reproducible stand-in for everything the curation engine downloads:
+# - one feed per configured fetch URL, in the format that site really serves
+#   (RSS 2.0, Atom for Qiita, RSS 1.0 / RDF for *.rdf feeds)
+# - hnrss.org feeds carry "Points: N" summaries and titles that match the
+#   keyword routes of feed_plan; Google News entries link to redirects
+# - a share of the stories is syndicated through several feeds (same title,
+#   aggregator suffix), so dedup has real work to do
+# - Japanese and English article pages with navigation / cookie / newsletter
+#   boilerplate and script padding, like the publisher pages trafilatura sees
+# Corpus.lookup() serves it all by URL (see benchmarks/standins.py).
+#   python benchmarks/corpus.py OUT_DIR   writes the corpus to disk for inspection
+ENGLISH_HOSTS = ("hnrss.org", "techcrunch.com", "lifehacker.com")
+AGGREGATOR_HOST = "news.google.com"
+HN_HOST = "hnrss.org"
+HN_KEYWORDS = ["AI", "LLM", "ChatGPT", "Hardware", "Gadget", "Business", "Market", "Economy", "Science", "Space", "Physics"]
+EN_PUBLISHERS = ["techcrunch.com", "www.theverge.com", "arstechnica.com", "www.wired.com", "lifehacker.com"]
+JA_PUBLISHERS = ["www.itmedia.co.jp", "gigazine.net", "www.gizmodo.jp", "japanese.engadget.com", "wired.jp", "ascii.jp"]
+
+EN_COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Labs", "Cyberdyne", "Tyrell", "Wayne Tech", "Soylent"]
+EN_VERBS = ["unveils", "launches", "tests", "ships", "open-sources", "delays", "expands", "benchmarks"]
+EN_NOUNS = ["model", "chip", "robot", "assistant", "headset", "platform", "satellite", "battery"]
+EN_DOMAINS = ["developers", "hospitals", "schools", "factories", "startups", "gamers", "banks", "researchers"]
+EN_TOPICS = [
+    "model training data compute cluster benchmark accuracy parameters inference latency",
+    "startup funding round investors valuation revenue market growth customers enterprise",
+    "chip wafer foundry transistor memory bandwidth power efficiency design node",
+    "policy regulation safety privacy law government agency compliance risk audit",
+    "robot sensor vision control motion warehouse autonomy navigation hardware battery",
+]
+EN_FILLER = "the a of and to in for on with that this is was are as by from it its has have will can".split()
+
+JA_COMPANIES = ["ソニー", "トヨタ", "富士通", "NEC", "楽天", "ソフトバンク", "任天堂", "パナソニック", "日立", "シャープ"]
+JA_PRODUCTS = ["生成AI", "新型チップ", "ロボット", "スマートグラス", "翻訳エンジン", "自動運転システム", "家庭用蓄電池", "衛星通信"]
+JA_NOUNS = ["モデル", "半導体", "スタートアップ", "投資", "規制", "研究者", "データセンター", "消費電力",
+            "スマートフォン", "市場", "企業", "開発者", "性能", "学習データ", "推論", "利用者", "業務", "価格"]
+JA_VERBS = ["発表した", "強化している", "大きく改善した", "導入する見込みだ", "検討している", "公開した", "拡大している"]
+NOISE_LINES = ["Subscribe to our newsletter for the latest updates and offers",
+               "We use cookies to improve your experience on this website",
+               "Sign in to save articles and manage your account settings"]
+
+class Corpus:
+    """
+    URL -> response table. Keys are host + path (+ '?' + query), without the scheme.
+    """
+    def __init__(self):
+        self.pages = {}
+        self.redirects = {}
+
+    @staticmethod
+    def key(url):
+        parts = urlsplit(url)
+        return parts.netloc + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    def add(self, url, content_type, body):
+        self.pages[self.key(url)] = (content_type, body)
+
+    def redirect(self, url, location):
+        self.redirects[self.key(url)] = location
+
+    def lookup(self, key):
+        """
+        Returns (status, content_type, body, location).
+        """
+        if key in self.redirects:
+            return 302, None, b"", self.redirects[key]
+        if key in self.pages:
+            content_type, body = self.pages[key]
+            return 200, content_type, body, None
+        return 404, "text/plain", b"not found", None
+
+    def size(self):
+        return sum(len(body) for _, body in self.pages.values())
+
+class Story:
+    def __init__(self, uid, english, title, link, published, topic):
+        self.uid = uid
+        self.english = english
+        self.title = title
+        self.link = link
+        self.published = published
+        self.topic = topic
+
+def _is_english_feed(url):
+    host = urlsplit(url).hostname or ""
+    return any(host.endswith(h) for h in ENGLISH_HOSTS)
+
+def _feed_format(url):
+    host = urlsplit(url).hostname or ""
+    if url.endswith(".rdf"):
+        return "rdf"
+    if host.endswith("qiita.com"):
+        return "atom"
+    return "rss"
+
+def _en_title(rng, uid, keyword=None):
+    title = f"{rng.choice(EN_COMPANIES)} {rng.choice(EN_VERBS)} {rng.choice(EN_NOUNS)} N{uid} for {rng.choice(EN_DOMAINS)}"
+    return f"{keyword}: {title}" if keyword else title
+
+def _ja_title(rng, uid):
+    return f"{rng.choice(JA_COMPANIES)}、{rng.choice(JA_PRODUCTS)}「N{uid}」を{rng.choice(JA_VERBS)} {rng.choice(JA_NOUNS)}向け"
+
+def _en_sentence(rng, words):
+    tokens = [rng.choice(words) if rng.random() < 0.5 else rng.choice(EN_FILLER) for _ in range(rng.randint(8, 22))]
+    return " ".join(tokens).capitalize() + "."
+
+def _ja_sentence(rng):
+    return f"{rng.choice(JA_NOUNS)}の{rng.choice(JA_NOUNS)}は{rng.choice(JA_NOUNS)}と{rng.choice(JA_NOUNS)}を{rng.choice(JA_VERBS)}。"
+
+def article_html(story, paragraphs=8, padding=30000):
+    # Seeded by the story, so every run (and every feed linking it) serves the same page
+    rng = random.Random(int(hashlib.md5(story.uid.encode('utf-8')).hexdigest(), 16))
+    if story.english:
+        words = EN_TOPICS[story.topic].split()
+        body = [" ".join(_en_sentence(rng, words) for _ in range(4)) for _ in range(paragraphs)]
+        lang = "en"
+    else:
+        body = ["".join(_ja_sentence(rng) for _ in range(4)) for _ in range(paragraphs)]
+        lang = "ja"
+    script = "var cfg = " + repr(["x" * 64] * (padding // 70)) + ";"
+    nav = "".join(f"<li><a href=\"/section/{i}\">Section {i}</a></li>" for i in range(12))
+    return (
+        f"<!DOCTYPE html><html lang=\"{lang}\"><head><meta charset=\"utf-8\"><title>{escape(story.title)}</title>"
+        f"<script>{script}</script></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav><p>{NOISE_LINES[2]}</p></header>"
+        f"<main><article><h1>{escape(story.title)}</h1>"
+        f"<time datetime=\"{story.published.isoformat()}\">{story.published:%Y-%m-%d}</time>"
+        + "".join(f"<p>{escape(p)}</p>" for p in body) +
+        f"</article></main>"
+        f"<aside><p>{NOISE_LINES[0]}</p></aside><footer><p>{NOISE_LINES[1]}</p></footer>"
+        f"</body></html>"
+    ).encode('utf-8')
+
+def _summary(rng, story, url):
+    host = urlsplit(url).hostname or ""
+    if host == HN_HOST:
+        return f"<p>Article URL: <a href=\"{story.link}\">{story.link}</a></p><p>Points: {rng.randint(20, 400)}</p><p># Comments: {rng.randint(0, 300)}</p>"
+    if story.english:
+        return f"<p>{_en_sentence(rng, EN_TOPICS[story.topic].split())} {_en_sentence(rng, EN_TOPICS[story.topic].split())}</p>"
+    return f"<p>{_ja_sentence(rng)}{_ja_sentence(rng)}</p>"
+
+def _rss(url, items):
+    body = "".join(
+        f"<item><title>{escape(title)}</title><link>{escape(link)}</link>"
+        f"<guid isPermaLink=\"false\">{escape(link)}</guid>"
+        f"<pubDate>{format_datetime(published)}</pubDate>"
+        f"<description>{escape(summary)}</description></item>"
+        for title, link, published, summary in items
+    )
+    return ("<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\"><channel>"
+            f"<title>{escape(url)}</title><link>{escape(url)}</link><description>stand-in</description>{body}</channel></rss>").encode('utf-8')
+
+def _atom(url, items):
+    body = "".join(
+        f"<entry><title>{escape(title)}</title><link rel=\"alternate\" href=\"{escape(link)}\"/>"
+        f"<id>{escape(link)}</id><published>{published.isoformat()}</published><updated>{published.isoformat()}</updated>"
+        f"<content type=\"html\">{escape(summary)}</content></entry>"
+        for title, link, published, summary in items
+    )
+    return ("<?xml version=\"1.0\" encoding=\"UTF-8\"?><feed xmlns=\"http://www.w3.org/2005/Atom\">"
+            f"<title>{escape(url)}</title><id>{escape(url)}</id><updated>{datetime.now(timezone.utc).isoformat()}</updated>{body}</feed>").encode('utf-8')
+
+def _rdf(url, items):
+    seq = "".join(f"<rdf:li rdf:resource=\"{escape(link)}\"/>" for _, link, _, _ in items)
+    body = "".join(
+        f"<item rdf:about=\"{escape(link)}\"><title>{escape(title)}</title><link>{escape(link)}</link>"
+        f"<description>{escape(summary)}</description><dc:date>{published.isoformat()}</dc:date></item>"
+        for title, link, published, summary in items
+    )
+    return ("<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            "<rdf:RDF xmlns:rdf=\"http://www.w3.org/1999/02/22-rdf-syntax-ns#\" xmlns=\"http://purl.org/rss/1.0/\" xmlns:dc=\"http://purl.org/dc/elements/1.1/\">"
+            f"<channel rdf:about=\"{escape(url)}\"><title>{escape(url)}</title><link>{escape(url)}</link><description>stand-in</description>"
+            f"<items><rdf:Seq>{seq}</rdf:Seq></items></channel>{body}</rdf:RDF>").encode('utf-8')
+
+FEED_WRITERS = {
+    "rss": ("application/rss+xml", _rss),
+    "atom": ("application/atom+xml", _atom),
+    "rdf": ("application/rdf+xml", _rdf),
+}
+
+def build_corpus(feed_urls, entries_per_feed=20, paragraphs=8, duplicate_rate=0.15, padding=30000, seed=7, now=None):
+    """
+    Builds the Corpus for feed_urls (the fetch URLs of feed_plan). Publication times
+    are spread over the 48 hours before now, so everything counts as fresh.
+    """
+    rng = random.Random(seed)
+    now = now or time.time()
+    corpus = Corpus()
+    stories = {True: [], False: []}
+    counter = 0
+
+    def new_story(english, keyword=None):
+        nonlocal counter
+        counter += 1
+        uid = f"{counter:05d}"
+        publisher = rng.choice(EN_PUBLISHERS if english else JA_PUBLISHERS)
+        published = datetime.fromtimestamp(now - rng.uniform(0, 48 * 3600), timezone.utc)
+        title = _en_title(rng, counter, keyword) if english else _ja_title(rng, counter)
+        story = Story(uid, english, title, f"https://{publisher}/articles/{uid}", published, rng.randrange(len(EN_TOPICS)))
+        stories[english].append(story)
+        corpus.add(story.link, "text/html; charset=utf-8", article_html(story, paragraphs, padding))
+        return story
+
+    for url in feed_urls:
+        english = _is_english_feed(url)
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        items = []
+        # hnrss honours ?count=, and the one broad HN fetch feeds several categories
+        count = int(parse_qs(parts.query).get("count", [entries_per_feed])[0])
+        for _ in range(count):
+            pool = stories[english]
+            if pool and rng.random() < duplicate_rate:
+                # Syndicated copy of a story another feed already carries
+                story = rng.choice(pool)
+            else:
+                story = new_story(english, rng.choice(HN_KEYWORDS) if host == HN_HOST else None)
+            title, link = story.title, story.link
+            if host == AGGREGATOR_HOST:
+                title = f"{title} - {urlsplit(story.link).hostname}"
+                link = f"https://{AGGREGATOR_HOST}/rss/articles/{story.uid}"
+                corpus.redirect(link, story.link)
+            items.append((title, link, story.published, _summary(rng, story, url)))
+        items.sort(key=lambda item: item[2], reverse=True)
+        content_type, writer = FEED_WRITERS[_feed_format(url)]
+        corpus.add(url, content_type, writer(url, items))
+    return corpus
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from feed_plan import unique_fetch_urls
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("out_dir")
+    ap.add_argument("--entries", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    corpus = build_corpus(unique_fetch_urls(), args.entries, seed=args.seed)
+    for key, (_, body) in corpus.pages.items():
+        path = os.path.join(args.out_dir, hashlib.md5(key.encode('utf-8')).hexdigest()[:12] + "_" + key.replace("/", "_")[:60].replace("?", "_"))
+        os.makedirs(args.out_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+    print(f"{len(corpus.pages)} pages, {corpus.size() / 1e6:.1f} MB -> {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
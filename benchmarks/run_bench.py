@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is reported as n/a
+    resource = None
+
+# Offline end-to-end benchmark of both curation entry points
+# (generate_curation.run_curation and extractor.get_latest_ai_news).
+# The parent builds a synthetic corpus (benchmarks/corpus.py) and serves it from a
+# local stand-in server (benchmarks/standins.py); every round then runs in a fresh
+# child process whose working directory is a scratch workspace (its own data/),
+# with http_client routed to the stand-in and translation.StandinBackend.
+# Round 1 is cold; later rounds reuse the workspace (feed 304s, article store,
+# translation cache), like the periodic refresh.
+# Reported per round: wall time, articles/s, p50/p95 latency of every pipeline stage
+# (each run_blocking / run_translation / run_cpu call, by function name), peak RSS of the process and
+# of its largest CPU worker, and CPU time including the workers.
+#   python benchmarks/run_bench.py [--entry curation|latest|both] [--rounds 2]
+#       [--latency 0.05] [--failure-rate 0.02] [--translate-latency 0.15] [--json out.json]
+RESULT_PREFIX = "BENCH_RESULT "
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+# --- child: one round of one entry point --- #
+def _instrument(stages):
+    import pipeline
+
+    run_blocking, run_translation, run_cpu = pipeline.run_blocking, pipeline.run_translation, pipeline.run_cpu
+
+    def timed(run, kind):
+        async def wrapper(fn, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await run(fn, *args, **kwargs)
+            finally:
+                stages.setdefault(f"{kind}:{getattr(fn, '__name__', 'call')}", []).append(time.perf_counter() - start)
+        return wrapper
+
+    # Before the entry modules import them by name
+    pipeline.run_blocking = timed(run_blocking, "io")
+    pipeline.run_translation = timed(run_translation, "io")
+    pipeline.run_cpu = timed(run_cpu, "cpu")
+    return pipeline
+
+def _peak_rss_mb(who):
+    if resource is None:
+        return None
+    kb = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return kb / (1024 * 1024) if sys.platform == "darwin" else kb / 1024
+
+def run_child(args):
+    import http_client
+    import translation
+    from standins import route_session
+
+    stages = {}
+    pipeline = _instrument(stages)
+    route_session(http_client._session, args.base_url)
+    translator = translation.StandinBackend(args.translate_latency, args.translate_jitter, args.translate_failure_rate, args.seed)
+    translation.set_backend(translator)
+
+    start_times = os.times()
+    start = time.perf_counter()
+    if args.child == "curation":
+        import generate_curation
+        import snapshot_store
+        generate_curation.run_curation()
+        articles = len(snapshot_store.load_current()[1])
+    else:
+        import extractor
+        articles = len(extractor.get_latest_ai_news())
+    wall = time.perf_counter() - start
+
+    # Join the CPU workers so their CPU time and peak RSS are accounted to us
+    if pipeline._process_pool is not None:
+        pipeline._process_pool.shutdown(wait=True)
+    end_times = os.times()
+
+    summary = {}
+    for name, durations in stages.items():
+        durations.sort()
+        summary[name] = {"n": len(durations), "total": sum(durations), "p50": percentile(durations, 0.5), "p95": percentile(durations, 0.95)}
+    print(RESULT_PREFIX + json.dumps({
+        "articles": articles,
+        "wall": wall,
+        "cpu": (end_times.user - start_times.user) + (end_times.system - start_times.system),
+        "cpu_workers": (end_times.children_user - start_times.children_user) + (end_times.children_system - start_times.children_system),
+        "rss_mb": _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        "worker_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        "stages": summary,
+        "translator": translator.as_dict(),
+    }))
+
+# --- parent --- #
+def run_round(args, entry, workspace, base_url):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", entry, "--base-url", base_url,
+           "--translate-latency", str(args.translate_latency), "--translate-jitter", str(args.translate_jitter),
+           "--translate-failure-rate", str(args.translate_failure_rate), "--seed", str(args.seed)]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    if args.cpu_workers:
+        env["AINEWS_CPU_WORKERS"] = str(args.cpu_workers)
+    proc = subprocess.run(cmd, cwd=workspace, env=env, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    if args.verbose:
+        print(proc.stdout)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"{entry} run failed (exit {proc.returncode}):\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+
+def _mb(value):
+    return f"{value:7.1f} MB" if value is not None else "    n/a"
+
+def print_result(entry, round_no, result, server):
+    wall = result["wall"]
+    print(f"\n== {entry} round {round_no} ==")
+    print(f"articles: {result['articles']}  wall: {wall:.2f} s  throughput: {result['articles'] / max(wall, 1e-9):.2f} articles/s")
+    print(f"CPU: {result['cpu']:.2f} s main + {result['cpu_workers']:.2f} s workers"
+          f"  peak RSS: {_mb(result['rss_mb'])} main, {_mb(result['worker_rss_mb'])} largest worker")
+    print(f"server: {server['requests']} requests, {server['not_modified']} x 304, {server['failures']} failed,"
+          f" {server['stalls']} stalled, {server['bytes_sent'] / 1e6:.1f} MB"
+          f"  translator: {result['translator']['calls']} calls, {result['translator']['failures']} failed")
+    print(f"  {'stage':<34}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for name, s in sorted(result["stages"].items(), key=lambda item: -item[1]["total"]):
+        print(f"  {name:<34}{s['n']:>6}{s['p50'] * 1000:>10.1f}{s['p95'] * 1000:>10.1f}{s['total']:>10.2f}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entry", choices=["curation", "latest", "both"], default="both")
+    ap.add_argument("--rounds", type=int, default=2, help="round 1 is cold, later rounds reuse the workspace")
+    ap.add_argument("--entries", type=int, default=20, help="entries per synthetic feed")
+    ap.add_argument("--paragraphs", type=int, default=8, help="paragraphs per article page")
+    ap.add_argument("--duplicate-rate", type=float, default=0.15)
+    ap.add_argument("--latency", type=float, default=0.05, help="stand-in server latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.03)
+    ap.add_argument("--failure-rate", type=float, default=0.0)
+    ap.add_argument("--stall-rate", type=float, default=0.0)
+    ap.add_argument("--stall-seconds", type=float, default=5.0)
+    ap.add_argument("--translate-latency", type=float, default=0.15)
+    ap.add_argument("--translate-jitter", type=float, default=0.05)
+    ap.add_argument("--translate-failure-rate", type=float, default=0.0)
+    ap.add_argument("--cpu-workers", type=int, help="AINEWS_CPU_WORKERS for the runs")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--json", help="also write the raw results here")
+    ap.add_argument("--keep", action="store_true", help="keep the scratch workspaces")
+    ap.add_argument("--verbose", action="store_true", help="show the engine's own output")
+    ap.add_argument("--child", choices=["curation", "latest"], help=argparse.SUPPRESS)
+    ap.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    from feed_plan import unique_fetch_urls
+    from corpus import build_corpus
+    from standins import StandinServer
+
+    corpus = build_corpus(unique_fetch_urls(), args.entries, args.paragraphs, args.duplicate_rate, seed=args.seed)
+    server = StandinServer(corpus, args.latency, args.jitter, args.failure_rate, args.stall_rate, args.stall_seconds, args.seed)
+    base_url = server.start()
+    print(f"corpus: {len(corpus.pages)} pages ({corpus.size() / 1e6:.1f} MB) served at {base_url}")
+
+    entries = ["curation", "latest"] if args.entry == "both" else [args.entry]
+    results = {}
+    try:
+        for entry in entries:
+            workspace = tempfile.mkdtemp(prefix=f"bench_{entry}_")
+            try:
+                for round_no in range(1, args.rounds + 1):
+                    before = server.stats.as_dict()
+                    result = run_round(args, entry, workspace, base_url)
+                    after = server.stats.as_dict()
+                    result["server"] = {k: after[k] - before[k] for k in after}
+                    results.setdefault(entry, []).append(result)
+                    print_result(entry, round_no, result, result["server"])
+            finally:
+                if args.keep:
+                    print(f"workspace kept: {workspace}")
+                else:
+                    shutil.rmtree(workspace, ignore_errors=True)
+    finally:
+        server.stop()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
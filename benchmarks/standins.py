@@ -0,0 +1,129 @@
+import hashlib
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+# Local stand-ins for the outside world, used by benchmarks/run_bench.py.
+# - StandinServer serves a benchmarks.corpus.Corpus over HTTP with configurable
+#   latency / jitter, failure (503) and stall rates, and answers If-None-Match
+#   with 304 like the real feed hosts
+# - route_session() mounts an adapter on a requests Session that sends every
+#   https:// request to the server as /<host><path>, so the engine keeps its real
+#   URLs (per-host gates, hnrss routing, aggregator detection all behave as live)
+# The translator stand-in is translation.StandinBackend.
+class ServerStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.stalls = 0
+        self.bytes_sent = 0
+
+    def add(self, field, amount=1):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def as_dict(self):
+        with self.lock:
+            return {k: v for k, v in vars(self).items() if k != "lock"}
+
+class StandinServer:
+    def __init__(self, corpus, latency=0.05, jitter=0.03, failure_rate=0.0, stall_rate=0.0, stall_seconds=5.0, seed=7):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.stats = ServerStats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._httpd = None
+        self._etags = {key: hashlib.md5(body).hexdigest() for key, (_, body) in corpus.pages.items()}
+
+    def _roll(self):
+        with self._rng_lock:
+            return self._rng.random(), self._rng.random(), self._rng.uniform(-self.jitter, self.jitter)
+
+    def start(self, port=0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._serve(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _serve(self, handler):
+        self.stats.add("requests")
+        fail, stall, jitter = self._roll()
+        time.sleep(max(0.0, self.latency + jitter))
+        if stall < self.stall_rate:
+            self.stats.add("stalls")
+            time.sleep(self.stall_seconds)
+        if fail < self.failure_rate:
+            self.stats.add("failures")
+            self._send(handler, 503, "text/plain", b"unavailable")
+            return
+
+        key = handler.path.lstrip("/")
+        status, content_type, body, location = self.corpus.lookup(key)
+        etag = self._etags.get(key)
+        if status == 200 and etag and handler.headers.get("If-None-Match") == etag:
+            self.stats.add("not_modified")
+            self._send(handler, 304, None, b"", {"ETag": etag})
+            return
+        headers = {}
+        if etag:
+            headers["ETag"] = etag
+        if location:
+            headers["Location"] = location
+        self._send(handler, status, content_type, body, headers)
+
+    def _send(self, handler, status, content_type, body, headers=None):
+        handler.send_response(status)
+        if content_type:
+            handler.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+        self.stats.add("bytes_sent", len(body))
+
+class StandinAdapter(HTTPAdapter):
+    def __init__(self, base_url, **kwargs):
+        self.base_url = base_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.base_url}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+def route_session(session, base_url):
+    # Same pool sizes as http_client's own adapter
+    session.mount("https://", StandinAdapter(base_url, pool_connections=64, pool_maxsize=16, max_retries=1))
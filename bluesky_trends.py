@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+import urllib.parse
+import http_client
+
+# Bluesky SNS trends, refreshed in the background and persisted to disk.
+# Page renders only read the last good copy (stale-while-revalidate), so page
+# latency never depends on public.api.bsky.app.
+CACHE_PATH = os.path.join("data", "bluesky_trends.json")
+REFRESH_INTERVAL = 300 # seconds
+REQUEST_TIMEOUT = (3, 5) # (connect, read) seconds, hard limit per request
+
+# searchPosts API requires auth. We use getFeed on a known Japanese News Custom Feed as a public unauthenticated workaround.
+# "ニュース（日本語）" Feed DID
+FEED_URI = "at://did:plc:ssebkmhtxgk33r67ggkfl7xr/app.bsky.feed.generator/aaaajtub7bar2"
+KEYWORDS = ["AI", "ChatGPT", "LLM", "OpenAI", "生成AI", "人工知能"]
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+def fetch_trends():
+    """
+    Fetches and filters the feed. Raises on network/API errors.
+    """
+    # Fetch 100 recent posts from the news feed to ensure we find enough AI related posts
+    url = f"https://public.api.bsky.app/xrpc/app.bsky.feed.getFeed?feed={urllib.parse.quote(FEED_URI)}&limit=100"
+    response = http_client.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    feed_items = response.json().get('feed', [])
+
+    # Extract actual posts and filter by AI keywords
+    ai_posts = []
+    for item in feed_items:
+        post = item.get('post', {})
+        text = post.get('record', {}).get('text', '')
+
+        # Simple keyword matching
+        if any(k.lower() in text.lower() for k in KEYWORDS):
+            ai_posts.append(post)
+
+    # Fallback if too few filtered results: just return the latest news
+    if len(ai_posts) < 3:
+        # If we couldn't find enough AI specific news, just return general tech/news trends to avoid empty state
+        return [item.get('post') for item in feed_items[:25]]
+    return ai_posts[:25]
+
+def current_version():
+    try:
+        return os.path.getmtime(CACHE_PATH)
+    except OSError:
+        return 0
+
+def load_posts():
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get("posts", [])
+    except Exception:
+        return []
+
+def refresh():
+    posts = fetch_trends()
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"fetched_at": time.time(), "posts": posts}, f, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_PATH)
+
+def _refresh_loop():
+    while True:
+        # Several Streamlit workers may run this loop; whoever sees a stale file refreshes it
+        if time.time() - current_version() >= REFRESH_INTERVAL:
+            try:
+                refresh()
+            except Exception as e:
+                # Keep serving the last good copy
+                print("Bluesky backend fetch error:", e)
+        time.sleep(30)
+
+def start_background_refresh():
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_loop, name="bluesky-refresher", daemon=True)
+            _refresher.start()
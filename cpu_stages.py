@@ -0,0 +1,112 @@
+from collections import Counter
+from lazy_deps import lazy
+from nlp_engine import get_engine
+import text_processing
+from summarizer import summarize_batch
+
+trafilatura = lazy("trafilatura")
+
+# CPU-bound curation stages, executed on pipeline.run_cpu workers.
+# Everything here is a module-level function that takes and returns plain
+# bytes / strings / tuples, so crossing the process boundary stays cheap.
+# Network work (downloads, translation) stays with the callers on threads.
+
+EXTRACT_FAILED = "※本文が短すぎる、または構造の問題により文章を抽出できませんでした。"
+NO_SENTENCES = "※本文から意味のある文章を抽出できませんでした。"
+
+def tag_words(doc, num_tags=3):
+    """
+    Returns (words, is_english): the most frequent keywords of a CleanText.
+    English keywords still need translating; for Japanese text we pick the
+    alphanumeric English terms (e.g. "Apple", "GPT-4") as they are.
+    """
+    if len(doc) < 10:
+        return [], False
+
+    is_english = doc.is_english
+    engine = get_engine()
+    tokens = engine.word_tokenize(doc.text)
+    if is_english:
+        stop_words = engine.tag_stop_words()
+        # Focus on capitalized words (proper nouns/products) or long words
+        candidates = [w for w in tokens if w not in stop_words and len(w) > 3 and not w.isnumeric()]
+    else:
+        # Since we don't have MeCab installed, this is a rough heuristic
+        candidates = [w for w in tokens if w.isalnum() and len(w) > 2 and any(c.isalpha() for c in w) and all(ord(c) < 128 for c in w)]
+
+    # Super simple frequency distribution to find the 'core' themes
+    freq = Counter(candidates)
+    return [word for word, count in freq.most_common(num_tags)], is_english
+
+def analyze_html(html, num_tags=3):
+    """
+    Extraction + lead + tag keywords for one downloaded page (generate_curation).
+    Returns (lead_sentence, read_time, tag_words, tags_are_english) or None.
+    """
+    text = trafilatura.extract(html)
+    if not text:
+        return None
+    doc = text_processing.clean(text)
+    if not doc:
+        return None, 1, [], False
+    words, is_english = tag_words(doc, num_tags)
+    # Lead-1 approach (Idea D variation: Take the first substantial sentence)
+    return doc.lead_sentence, doc.read_time, words, is_english
+
+def summary_lead(summary_html):
+    """
+    First sentence of an RSS summary, or None.
+    """
+    summary = text_processing.strip_html(summary_html)
+    return text_processing.lead_sentence([summary]) if summary else None
+
+def _summary_doc(html):
+    """
+    Returns (error_message, CleanText) for one downloaded page.
+    """
+    text = trafilatura.extract(html)
+    if not text:
+        return EXTRACT_FAILED, None
+    # --- IDEA C: Text Cleaning ---
+    doc = text_processing.clean(text)
+    if len(doc) < 100:
+        return EXTRACT_FAILED, None
+    return None, doc
+
+def summarize_html_batch(htmls, sentences_count=3):
+    """
+    Extraction + cleaning + Lead-1/LSA summary for downloaded pages (extractor).
+    The whole batch goes through summarizer.summarize_batch together.
+    Returns one (error_message, summary_text, is_english) per page; error_message is None on success.
+    """
+    prepared = [_summary_doc(html) for html in htmls]
+    # --- IDEA D: Hybrid Lead-1 + LSA Summarization ---
+    docs = [(doc.text, doc.lang) for error, doc in prepared if not error]
+    summaries = iter(summarize_batch(docs, sentences_count))
+
+    results = []
+    for error, doc in prepared:
+        if error:
+            results.append((error, None, False))
+            continue
+        final_sentences = next(summaries)
+        if not final_sentences:
+            results.append((NO_SENTENCES, None, False))
+        else:
+            results.append((None, " ".join(final_sentences), doc.is_english))
+    return results
+
+def strip_summaries(summaries, limit=200):
+    """
+    Plain-text RSS descriptions, truncated to limit characters.
+    """
+    descriptions = []
+    for summary in summaries:
+        try:
+            summary = text_processing.strip_html(summary)
+        except Exception:
+            pass
+        if len(summary) > limit:
+            summary = summary[:limit] + '...'
+        descriptions.append(summary)
+    return descriptions
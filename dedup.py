@@ -0,0 +1,142 @@
+import hashlib
+import os
+import re
+from lazy_deps import lazy
+from search_index import normalize, bigrams
+from text_processing import strip_html
+
+np = lazy("numpy")
+
+# Near-duplicate story detection, run on RSS titles + summaries before any
+# download / translation. The same story syndicated through Google News, Hatena,
+# Gizmodo, Engadget... collapses into one representative that carries the
+# others as `alt_sources`.
+# - shingles are character bigrams of the normalized text (Japanese and English)
+# - MinHash signatures + LSH banding find candidate pairs without comparing
+#   everything with everything; candidates are confirmed with the exact Jaccard
+# - two items are the same story if their titles are similar enough, or if both
+#   carry a substantial summary and those are near-identical (syndicated copies;
+#   the titles must still overlap a little, so boilerplate summaries never chain stories)
+# - titles naming different models / versions / numbers ("GPT-5" vs "GPT-4.5") never merge
+# - translate_title (optional callable) compares translated titles, so an English
+#   and a Japanese report of the same story can match as well
+#   (callers enable it with AINEWS_DEDUP_TRANSLATED_TITLES=1)
+TRANSLATED_TITLES = os.environ.get("AINEWS_DEDUP_TRANSLATED_TITLES", "0") == "1"
+TITLE_THRESHOLD = 0.5
+SUMMARY_THRESHOLD = 0.6
+SUMMARY_TITLE_MIN = 0.2
+MIN_SUMMARY_CHARS = 60
+SUMMARY_CHARS = 300
+NUM_PERM = 64
+BAND_ROWS = 2
+
+# Aggregator links are redirects that are hard to download; prefer the original publisher
+AGGREGATOR_HOSTS = ("news.google.com",)
+
+# " - ITmedia", " | TechCrunch" style suffixes that aggregators append to titles
+TITLE_SUFFIX_RE = re.compile(r"\s+[-|｜–—]\s+[^-|｜–—]{1,40}$")
+NON_WORD_RE = re.compile(r"[\W_]+")
+IDENTIFIER_RE = re.compile(r"[a-z]+-?\d[a-z0-9.]*|\d+(?:\.\d+)?[a-z]*")
+
+# Universal hashing modulo a 31-bit prime: (a * h + b) stays below 2^63 in uint64
+_PRIME = (1 << 31) - 1
+
+def _permutations():
+    rng = np.random.default_rng(20240601)
+    return (rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64),
+            rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64))
+
+def shingles(text):
+    return bigrams(NON_WORD_RE.sub("", normalize(text)))
+
+def clean_title(title):
+    return TITLE_SUFFIX_RE.sub("", title or "").strip()
+
+def identifiers(title):
+    return set(IDENTIFIER_RE.findall(normalize(title)))
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def minhash(shingle_set, perms):
+    if not shingle_set:
+        return None
+    a, b = perms
+    h = np.array([int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big') % _PRIME for s in shingle_set], dtype=np.uint64)
+    return ((np.multiply.outer(a, h) + b[:, None]) % _PRIME).min(axis=1)
+
+def candidate_pairs(shingle_sets, perms):
+    """
+    Index pairs that share at least one LSH band of their MinHash signatures.
+    """
+    buckets = {}
+    pairs = set()
+    for i, shingle_set in enumerate(shingle_sets):
+        signature = minhash(shingle_set, perms)
+        if signature is None:
+            continue
+        for band in range(0, NUM_PERM, BAND_ROWS):
+            key = (band, signature[band:band + BAND_ROWS].tobytes())
+            for j in buckets.get(key, ()):
+                pairs.add((j, i))
+            buckets.setdefault(key, []).append(i)
+    return pairs
+
+def _compatible_ids(a, b):
+    # One title may add a date or a spec, but neither may name something the other doesn't
+    return not a or not b or a <= b or b <= a
+
+def _prefer(link):
+    return 1 if any(host in (link or "") for host in AGGREGATOR_HOSTS) else 0
+
+def cluster(items, title_of, summary_of, link_of, translate_title=None):
+    """
+    Groups near-duplicate items. Returns [(representative, [duplicates])] in the
+    order of the clusters' first member (callers pass newest first).
+    """
+    titles = [clean_title(title_of(item)) for item in items]
+    if translate_title:
+        titles = [_translated(translate_title, t) for t in titles]
+    title_sets = [shingles(t) for t in titles]
+    title_ids = [identifiers(t) for t in titles]
+    summaries = [strip_html(summary_of(item) or "")[:SUMMARY_CHARS] for item in items]
+    summary_sets = [shingles(s) if len(s) >= MIN_SUMMARY_CHARS else set() for s in summaries]
+
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    perms = _permutations()
+    for sets, threshold, title_min in ((title_sets, TITLE_THRESHOLD, 0.0), (summary_sets, SUMMARY_THRESHOLD, SUMMARY_TITLE_MIN)):
+        for i, j in candidate_pairs(sets, perms):
+            if find(i) == find(j) or jaccard(sets[i], sets[j]) < threshold:
+                continue
+            if title_min and jaccard(title_sets[i], title_sets[j]) < title_min:
+                continue
+            if not _compatible_ids(title_ids[i], title_ids[j]):
+                continue
+            parent[find(j)] = find(i)
+
+    groups = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+
+    clusters = []
+    for members in sorted(groups.values(), key=lambda m: m[0]):
+        # Newest non-aggregator link represents the story
+        rep = min(members, key=lambda i: (_prefer(link_of(items[i])), i))
+        clusters.append((items[rep], [items[i] for i in members if i != rep]))
+    return clusters
+
+def alt_sources(duplicates, source_of, link_of):
+    return [{"source": source_of(d), "url": link_of(d)} for d in duplicates]
+
+def _translated(translate_title, title):
+    try:
+        return translate_title(title) or title
+    except Exception:
+        return title
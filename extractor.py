@@ -1,23 +1,21 @@
-import feedparser
 from datetime import datetime
 import time
-import trafilatura
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import nltk
-from bs4 import BeautifulSoup
-from dateutil import parser as dateutil_parser
-import pytz
+import asyncio
+from lazy_deps import lazy
+from feed_plan import fetch_entries
+from translation import translate, translate_many, save_cache
+from pipeline import run_blocking, run_translation, run_cpu, within, hedged, start_budget, CPU_WORKERS
+from http_client import fetch_html
+from feeds import LATEST_FEEDS
+import dedup
+import metrics
+from cpu_stages import summarize_html_batch, strip_summaries
 
-# Streamlit Cloudなどの環境で初回実行時にNLTKの必要な辞書をダウンロードする
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-    nltk.download('punkt_tab', quiet=True)
+# 重い依存は初めて使うステージで読み込む (起動を速くするため)
+# 抽出・要約などのCPU処理は cpu_stages でプロセスプールに回す
+feedparser = lazy("feedparser")
+dateutil_parser = lazy("dateutil.parser")
+pytz = lazy("pytz")
 
 def parse_date(date_string):
     if not date_string:
@@ -43,13 +41,16 @@ def parse_date(date_string):
         
     return datetime.now()
 
-def fetch_rss_feed(url, source_name):
+def fetch_rss_feed(url, source_name, strip_html=True):
+    """
+    strip_html=False leaves descriptions as raw HTML (the caller strips them on the CPU pool).
+    """
     articles = []
     try:
-        feed = feedparser.parse(url)
+        entries = fetch_entries(url)
         # To make auto-summarization faster, we limit the foreign sources slightly more
         limit = 10 if source_name in ["Hacker News", "TechCrunch"] else 15
-        for entry in feed.entries[:limit]:
+        for entry in entries[:limit]:
             title = entry.get('title', 'No Title')
             link = entry.get('link', '')
             
@@ -63,13 +64,8 @@ def fetch_rss_feed(url, source_name):
             pub_date = parse_date(published)
             
             summary = entry.get('summary', '')
-            try:
-                summary = BeautifulSoup(summary, "html.parser").get_text(separator=' ', strip=True)
-            except Exception:
-                pass
-                
-            if len(summary) > 200:
-                summary = summary[:200] + '...'
+            if strip_html:
+                summary = strip_summaries([summary])[0]
                 
             if source_name == "Hacker News" and "url" in entry:
                 link = entry.url
@@ -88,101 +84,83 @@ def fetch_rss_feed(url, source_name):
         
     return articles
 
-def summarize_and_translate(url, sentences_count=3):
-    try:
-        downloaded = trafilatura.fetch_url(url)
-        if not downloaded:
-            return "※URLから本文を取得できませんでした。"
-        
-        text = trafilatura.extract(downloaded)
-        if not text:
-            return "※本文が短すぎる、または構造の問題により文章を抽出できませんでした。"
+DOWNLOAD_FAILED = "※URLから本文を取得できませんでした。"
+SUMMARY_TIMEOUT = "※時間内に要約を生成できませんでした。"
 
-        # --- IDEA C: Text Cleaning ---
-        noise_words = ['cookie', 'subscribe', 'log in', 'sign in', 'sign up', 'newsletter', 'read more', 'javascript', 'please enable']
-        cleaned_lines = []
-        for line in text.split('\n'):
-            line_strip = line.strip()
-            # Remove very short lines (often UI text) and lines with explicitly noisy words
-            if len(line_strip) <= 15:
-                continue
-            lower_line = line_strip.lower()
-            if any(noise in lower_line for noise in noise_words):
-                continue
-            cleaned_lines.append(line_strip)
-            
-        cleaned_text = '\n'.join(cleaned_lines)
-        if len(cleaned_text) < 100:
-            return "※本文が短すぎる、または構造の問題により文章を抽出できませんでした。"
+def _summary_failed(e):
+    return f"※要約の生成に失敗しました: {str(e)}"
 
-        is_english = len([char for char in cleaned_text[:500] if ord(char) < 128]) / min(500, len(cleaned_text)) > 0.8
-        lang = "english" if is_english else "japanese"
-        
-        parser = PlaintextParser.from_string(cleaned_text, Tokenizer(lang))
-        
-        # --- IDEA D: Hybrid Lead-1 + LSA Summarization ---
-        sentences = list(parser.document.sentences)
-        if not sentences:
-            return "※本文から意味のある文章を抽出できませんでした。"
-            
-        first_sentence = str(sentences[0])
-        
-        summarizer = LsaSummarizer()
-        # Fetch candidates from LSA
-        candidate_sentences = [str(s) for s in summarizer(parser.document, sentences_count)]
-        
-        # Always include the Lead (first) sentence, then fill the rest with LSA
-        final_sentences = [first_sentence]
-        for s in candidate_sentences:
-            if s != first_sentence and len(final_sentences) < sentences_count:
-                final_sentences.append(s)
-                
-        summary_text = " ".join(final_sentences)
-        
-        if is_english:
-            translator = GoogleTranslator(source='auto', target='ja')
-            summary_text = translator.translate(summary_text)
+async def summarize_articles(urls, sentences_count=3):
+    """
+    Japanese summaries for several URLs. Downloads run concurrently; the pages are
+    then summarized in one batch per CPU worker (summarizer.summarize_batch) and the
+    English summaries translated together (translate_many).
+    """
+    # 締め切りを過ぎた段階は失敗扱い (記事にはRSSの説明文が残る)
+    downloads = await asyncio.gather(*[within("download", hedged(fetch_html, url)) for url in urls])
+    results = [(DOWNLOAD_FAILED, None, False)] * len(urls)
+    pages = [i for i, downloaded in enumerate(downloads) if downloaded]
 
-        return summary_text
-    except Exception as e:
-        return f"※要約の生成に失敗しました: {str(e)}"
+    batches = [pages[i::CPU_WORKERS] for i in range(min(CPU_WORKERS, len(pages)))]
+    batch_results = await asyncio.gather(*[within("summarize", run_cpu(summarize_html_batch, [downloads[i] for i in batch], sentences_count)) for batch in batches], return_exceptions=True)
+    for batch, summaries in zip(batches, batch_results):
+        for pos, i in enumerate(batch):
+            if summaries is None:
+                results[i] = (SUMMARY_TIMEOUT, None, False)
+            elif isinstance(summaries, Exception):
+                results[i] = (_summary_failed(summaries), None, False)
+            else:
+                results[i] = summaries[pos]
+
+    english = [summary for error, summary, is_english in results if not error and is_english]
+    translated = await within("translate", run_translation(translate_many, english), {}) if english else {}
+    summaries = []
+    for error, summary, is_english in results:
+        if error or not is_english:
+            summaries.append(error or summary)
+        else:
+            summaries.append(translated.get(summary) or _summary_failed("翻訳に失敗しました"))
+    return summaries
+
+def summarize_and_translate(url, sentences_count=3):
+    return asyncio.run(summarize_articles([url], sentences_count))[0]
 
-def process_foreign_article(article):
-    # Translate original title to Japanese
+def translate_title(title):
     try:
-        translator = GoogleTranslator(source='auto', target='ja')
-        article["title_ja"] = translator.translate(article["title"])
+        return translate(title)
     except:
-        article["title_ja"] = article["title"]
-        
-    # Auto summarize and translate body content
-    article["summary_ja"] = summarize_and_translate(article["link"])
+        return title
+
+async def process_foreign_articles(articles):
+    # Translate all original titles (one packed request) while the bodies are downloaded and summarized
+    titles_ja, summaries_ja = await asyncio.gather(
+        within("translate", run_translation(translate_many, [a["title"] for a in articles]), {}),
+        summarize_articles([a["link"] for a in articles])
+    )
+    for article, summary_ja in zip(articles, summaries_ja):
+        article["title_ja"] = titles_ja.get(article["title"], article["title"])
+        article["summary_ja"] = summary_ja
 
 def get_latest_ai_news():
-    feeds = [
-        {"url": "https://qiita.com/tags/AI/feed", "name": "Qiita (AI)"},
-        {"url": "https://qiita.com/tags/ChatGPT/feed", "name": "Qiita (ChatGPT)"},
-        {"url": "https://zenn.dev/topics/ai/feed", "name": "Zenn (AI)"},
-        {"url": "https://news.google.com/rss/search?q=AI+%E6%B4%BB%E7%94%A8+%E4%BA%8B%E4%BE%8B&hl=ja&gl=JP&ceid=JP:ja", "name": "Google News (AI 活用事例)"},
-        {"url": "https://b.hatena.ne.jp/q/AI%20%E6%B4%BB%E7%94%A8?sort=recent&safe=on&mode=rss", "name": "Hatena Bookmark (AI)"},
-        {"url": "https://hnrss.org/newest?q=AI+OR+LLM+OR+ChatGPT&points=50", "name": "Hacker News"},
-        {"url": "https://techcrunch.com/category/artificial-intelligence/feed/", "name": "TechCrunch"},
-        # 新しいガジェット系ニュースサイトを追加
-        {"url": "https://www.gizmodo.jp/index.xml", "name": "Gizmodo Japan"},
-        {"url": "https://japanese.engadget.com/rss.xml", "name": "Engadget"},
-        {"url": "https://wired.jp/rss/index.xml", "name": "WIRED Japan"},
-        {"url": "https://gigazine.net/news/rss_2.0/", "name": "GIGAZINE"},
-        {"url": "https://rss.itmedia.co.jp/rss/2.0/news_bursts.xml", "name": "ITmedia"},
-        {"url": "https://ascii.jp/mac/rss.xml", "name": "ASCII.jp"},
-        {"url": "https://pc.watch.impress.co.jp/data/rss/1.0/pcw/feed.rdf", "name": "PC Watch"}
-    ]
-    
+    metrics.start_run()
+    articles = asyncio.run(collect_latest_ai_news(LATEST_FEEDS))
+    # 計測結果 (ステージ別・ホスト別) を保存
+    metrics.write(metrics.LATEST_PATH, metrics.finish_run())
+    return articles
+
+async def collect_latest_ai_news(feeds):
+    # 実行全体の時間予算 (pipeline.RUN_BUDGET)
+    start_budget()
     all_articles = []
-    # 複数フィードの取得も並列化して速度を上げる
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_feed = {executor.submit(fetch_rss_feed, feed["url"], feed["name"]): feed for feed in feeds}
-        for future in as_completed(future_to_feed):
-            all_articles.extend(future.result())
+    # 複数フィードの取得も並列化して速度を上げる (shared pipeline executor)
+    for articles in await asyncio.gather(*[within("feed", run_blocking(fetch_rss_feed, feed["url"], feed["name"], False), []) for feed in feeds]):
+        all_articles.extend(articles)
+
+    # HTML stripping of every description in one CPU-pool batch (inline if the pool is too slow)
+    raw = [a["description"] for a in all_articles]
+    descriptions = await within("analyze", run_cpu(strip_summaries, raw), budget=False) or strip_summaries(raw)
+    for article, description in zip(all_articles, descriptions):
+        article["description"] = description
             
     all_articles.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
     
@@ -194,13 +172,27 @@ def get_latest_ai_news():
             seen_links.add(article["link"])
             unique_articles.append(article)
             
+    # Same story through several feeds: keep one representative, the rest become alt_sources
+    if dedup.TRANSLATED_TITLES:
+        # One packed request warms the cache for every title cluster() will translate
+        await within("translate", run_translation(translate_many, [dedup.clean_title(a["title"]) for a in unique_articles]))
+    clusters = await within("dedup", run_blocking(
+        dedup.cluster, unique_articles,
+        lambda a: a["title"], lambda a: a["description"], lambda a: a["link"],
+        translate_title if dedup.TRANSLATED_TITLES else None
+    ))
+    if clusters is None:
+        clusters = [(article, []) for article in unique_articles]
+    unique_articles = []
+    for article, duplicates in clusters:
+        article["alt_sources"] = dedup.alt_sources(duplicates, lambda a: a["source"], lambda a: a["link"])
+        unique_articles.append(article)
+            
     unique_articles = unique_articles[:100]
             
-    # Process foreign articles automatically in parallel (Translation + Summary)
+    # Process foreign articles automatically in parallel (Translation + batched Summary)
     foreign_articles = [a for a in unique_articles if a.get("is_foreign")]
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(process_foreign_article, a) for a in foreign_articles]
-        for f in as_completed(futures):
-            pass
+    await process_foreign_articles(foreign_articles)
             
+    save_cache()
     return unique_articles
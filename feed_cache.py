@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+import http_client
+import metrics
+from lazy_deps import lazy
+
+feedparser = lazy("feedparser")
+
+# Persistent conditional-GET cache for RSS/Atom feeds.
+# Each feed keeps its ETag / Last-Modified and parsed entries on disk, so an
+# unchanged feed costs a single 304 round-trip instead of a full download + parse.
+CACHE_DIR = os.path.join("data", "feed_cache")
+
+_write_lock = threading.Lock()
+
+def _cache_path(url):
+    return os.path.join(CACHE_DIR, hashlib.md5(url.encode('utf-8')).hexdigest() + ".json")
+
+def load_cached(url):
+    try:
+        with open(_cache_path(url), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _save(url, record):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(url)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with _write_lock:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # struct_time values (published_parsed etc.) serialize as plain lists
+            json.dump(record, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+def _from_cache(record, status):
+    entries = [feedparser.FeedParserDict(e) for e in record.get('entries', [])]
+    return feedparser.FeedParserDict(entries=entries, status=status, from_cache=True)
+
+def cached_feed(url):
+    """
+    The last good copy of a feed without any network request, or None.
+    """
+    cached = load_cached(url)
+    return _from_cache(cached, None) if cached else None
+
+def fetch_feed(url):
+    """
+    Drop-in replacement for feedparser.parse(url) that sends If-None-Match /
+    If-Modified-Since and reuses the cached entries when the server answers 304.
+    """
+    cached = load_cached(url)
+    headers = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached.get('modified'):
+        headers['If-Modified-Since'] = cached['modified']
+
+    try:
+        with metrics.stage("feed.download"):
+            response = http_client.get(url, headers=headers)
+    except Exception as e:
+        print(f"Feed request failed for {url}: {e}")
+        # Network error: serve the last good copy instead of nothing
+        if cached:
+            metrics.count("feed_cache.stale")
+            return _from_cache(cached, None)
+        return feedparser.FeedParserDict(entries=[], status=None, bozo=1)
+
+    if response.status_code == 304 and cached:
+        metrics.count("feed_cache.not_modified")
+        return _from_cache(cached, 304)
+
+    metrics.count("feed_cache.fetched")
+    with metrics.stage("feed.parse"):
+        feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+    feed['status'] = response.status_code
+
+    if response.status_code == 200 and feed.entries:
+        _save(url, {
+            "url": url,
+            "etag": response.headers.get('ETag'),
+            "modified": response.headers.get('Last-Modified'),
+            "entries": [dict(e) for e in feed.entries]
+        })
+        return feed
+
+    # Error status or empty response: serve the last good copy instead of nothing
+    if cached:
+        metrics.count("feed_cache.stale")
+        return _from_cache(cached, response.status_code)
+    return feed
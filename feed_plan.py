@@ -0,0 +1,129 @@
+import re
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlsplit, parse_qs
+from feed_cache import fetch_feed
+from feeds import CATEGORIES, LATEST_FEEDS
+
+# Feed-planning stage shared by both curation entry points.
+# - identical feed URLs (Zenn, WIRED, Gizmodo, TechCrunch...) are fetched and parsed once
+# - every keyword-filtered hnrss.org query is served from ONE broad hnrss fetch and
+#   routed to its category locally by keyword + points matching
+HN_HOST = "hnrss.org"
+HN_BROAD_URL = "https://hnrss.org/newest?points={points}&count=100"
+
+# Fetched feeds are shared for this long, so overlapping runs (or both entry
+# points in one process) reuse one parse per unique feed
+MEMO_TTL = 300
+
+_POINTS_RE = re.compile(r'Points:\s*(\d+)')
+
+class FeedRoute:
+    def __init__(self, url, fetch_url, keyword_re=None, min_points=0):
+        self.url = url
+        self.fetch_url = fetch_url
+        self.keyword_re = keyword_re
+        self.min_points = min_points
+
+    def accepts(self, entry):
+        if self.keyword_re and not self.keyword_re.search(entry.get('title', '')):
+            return False
+        if self.min_points:
+            match = _POINTS_RE.search(entry.get('summary', ''))
+            if match and int(match.group(1)) < self.min_points:
+                return False
+        return True
+
+def _hn_query(url):
+    parts = urlsplit(url)
+    if parts.hostname != HN_HOST or parts.path != "/newest":
+        return None
+    params = parse_qs(parts.query)
+    if 'q' not in params:
+        return None
+    keywords = [k.strip() for k in params['q'][0].split(' OR ') if k.strip()]
+    points = int(params.get('points', ['0'])[0] or 0)
+    return keywords, points
+
+def plan_feeds(feed_lists):
+    """
+    Builds {original url: FeedRoute} for every feed in feed_lists.
+    """
+    urls = []
+    for feed_list in feed_lists:
+        for feed in feed_list:
+            if feed["url"] not in urls:
+                urls.append(feed["url"])
+
+    hn_queries = {url: _hn_query(url) for url in urls}
+    hn_points = [q[1] for q in hn_queries.values() if q]
+    broad_url = HN_BROAD_URL.format(points=min(hn_points)) if hn_points else None
+
+    routes = {}
+    for url in urls:
+        query = hn_queries[url]
+        if query:
+            keywords, points = query
+            keyword_re = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in keywords) + r')\b', re.IGNORECASE)
+            routes[url] = FeedRoute(url, broad_url, keyword_re, points)
+        else:
+            routes[url] = FeedRoute(url, url)
+    return routes
+
+ROUTES = plan_feeds([feeds for feeds in CATEGORIES.values()] + [LATEST_FEEDS])
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+def _fetch_once(fetch_url):
+    now = time.monotonic()
+    with _memo_lock:
+        hit = _memo.get(fetch_url)
+        if hit and hit[0] > now:
+            future = hit[1]
+            owner = False
+        else:
+            future = Future()
+            _memo[fetch_url] = (now + MEMO_TTL, future)
+            owner = True
+
+    if owner:
+        try:
+            future.set_result(fetch_feed(fetch_url))
+        except Exception as e:
+            with _memo_lock:
+                _memo.pop(fetch_url, None)
+            future.set_exception(e)
+    return future.result()
+
+def expire(fetch_url):
+    """
+    Drops the memoized copy so the next fetch_entries goes to the network.
+    """
+    with _memo_lock:
+        _memo.pop(fetch_url, None)
+
+def prime(fetch_url, feed):
+    """
+    Serves feed for fetch_url for the next MEMO_TTL seconds (e.g. a cached copy
+    of a feed that isn't due for a refresh yet).
+    """
+    future = Future()
+    future.set_result(feed)
+    with _memo_lock:
+        _memo[fetch_url] = (time.monotonic() + MEMO_TTL, future)
+
+def fetch_entries(url):
+    """
+    Returns the entries for a configured feed URL, going through the shared plan.
+    Unknown URLs are simply fetched (and memoized) as-is.
+    """
+    route = ROUTES.get(url) or FeedRoute(url, url)
+    feed = _fetch_once(route.fetch_url)
+    if route.fetch_url == url:
+        return list(feed.entries)
+    return [entry for entry in feed.entries if route.accepts(entry)]
+
+def unique_fetch_urls():
+    return sorted({route.fetch_url for route in ROUTES.values()})
@@ -0,0 +1,46 @@
+# Feed definitions shared by both curation entry points
+
+# 5 Core Categories mapping to their respective RSS sources
+CATEGORIES = {
+    "AI・テクノロジートレンド": [
+        {"url": "https://hnrss.org/newest?q=AI+OR+LLM+OR+ChatGPT&points=100", "name": "Hacker News"},
+        {"url": "https://techcrunch.com/category/artificial-intelligence/feed/", "name": "TechCrunch"},
+        {"url": "https://zenn.dev/topics/ai/feed", "name": "Zenn"}
+    ],
+    "ガジェット・ハードウェア": [
+        {"url": "https://www.gizmodo.jp/index.xml", "name": "Gizmodo Japan"},
+        {"url": "https://hnrss.org/newest?q=Hardware+OR+Gadget&points=50", "name": "Hacker News Hardware"},
+        {"url": "https://japanese.engadget.com/rss.xml", "name": "Engadget"}
+    ],
+    "ビジネス・経済": [
+        {"url": "https://hnrss.org/newest?q=Business+OR+Market+OR+Economy&points=100", "name": "HN Business"},
+        {"url": "https://news.google.com/rss/search?q=%E3%83%86%E3%82%AF%E3%83%8E%E3%83%AD%E3%82%B8%E3%83%BC+%E4%BA%8B%E6%A5%AD&hl=ja&gl=JP&ceid=JP:ja", "name": "Google News Biz"}
+    ],
+    "ライフハック・仕事術": [
+        {"url": "https://b.hatena.ne.jp/q/%E3%83%A9%E3%82%A4%E3%83%95%E3%83%8F%E3%83%83%E3%82%AF?sort=recent&safe=on&mode=rss", "name": "Hatena Lifehack"},
+        {"url": "https://lifehacker.com/feed/rss", "name": "Lifehacker"}
+    ],
+    "サイエンス・未来予測": [
+        {"url": "https://hnrss.org/newest?q=Science+OR+Space+OR+Physics&points=100", "name": "HN Science"},
+        {"url": "https://wired.jp/rss/index.xml", "name": "WIRED Japan"}
+    ]
+}
+
+# Flat feed list used by extractor.get_latest_ai_news
+LATEST_FEEDS = [
+    {"url": "https://qiita.com/tags/AI/feed", "name": "Qiita (AI)"},
+    {"url": "https://qiita.com/tags/ChatGPT/feed", "name": "Qiita (ChatGPT)"},
+    {"url": "https://zenn.dev/topics/ai/feed", "name": "Zenn (AI)"},
+    {"url": "https://news.google.com/rss/search?q=AI+%E6%B4%BB%E7%94%A8+%E4%BA%8B%E4%BE%8B&hl=ja&gl=JP&ceid=JP:ja", "name": "Google News (AI 活用事例)"},
+    {"url": "https://b.hatena.ne.jp/q/AI%20%E6%B4%BB%E7%94%A8?sort=recent&safe=on&mode=rss", "name": "Hatena Bookmark (AI)"},
+    {"url": "https://hnrss.org/newest?q=AI+OR+LLM+OR+ChatGPT&points=50", "name": "Hacker News"},
+    {"url": "https://techcrunch.com/category/artificial-intelligence/feed/", "name": "TechCrunch"},
+    # 新しいガジェット系ニュースサイトを追加
+    {"url": "https://www.gizmodo.jp/index.xml", "name": "Gizmodo Japan"},
+    {"url": "https://japanese.engadget.com/rss.xml", "name": "Engadget"},
+    {"url": "https://wired.jp/rss/index.xml", "name": "WIRED Japan"},
+    {"url": "https://gigazine.net/news/rss_2.0/", "name": "GIGAZINE"},
+    {"url": "https://rss.itmedia.co.jp/rss/2.0/news_bursts.xml", "name": "ITmedia"},
+    {"url": "https://ascii.jp/mac/rss.xml", "name": "ASCII.jp"},
+    {"url": "https://pc.watch.impress.co.jp/data/rss/1.0/pcw/feed.rdf", "name": "PC Watch"}
+]
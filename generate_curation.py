@@ -1,54 +1,27 @@
-import feedparser
 from datetime import datetime
 import time
-import trafilatura
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import nltk
-from nltk.corpus import stopwords
-import string
+import asyncio
 import json
 import os
 import hashlib
-from bs4 import BeautifulSoup
-from dateutil import parser as dateutil_parser
-import pytz
+from lazy_deps import lazy
+from feed_plan import fetch_entries
+import article_store
+import snapshot_store
+import search_index
+import dedup
+import metrics
+from feeds import CATEGORIES
+from translation import translate, translate_many, save_cache
+from pipeline import run_blocking, run_translation, run_cpu, within, hedged, start_budget
+from cpu_stages import analyze_html, tag_words, summary_lead
+from text_processing import clean, is_english, starts_ascii
+from http_client import fetch_html
 
-# Setup NLTK (Download silently)
-for item in ['punkt', 'punkt_tab', 'stopwords']:
-    try:
-        if item == 'stopwords':
-            nltk.data.find('corpora/stopwords')
-        else:
-            nltk.data.find(f'tokenizers/{item}')
-    except LookupError:
-        nltk.download(item, quiet=True)
-
-# 5 Core Categories mapping to their respective RSS sources
-CATEGORIES = {
-    "AI・テクノロジートレンド": [
-        {"url": "https://hnrss.org/newest?q=AI+OR+LLM+OR+ChatGPT&points=100", "name": "Hacker News"},
-        {"url": "https://techcrunch.com/category/artificial-intelligence/feed/", "name": "TechCrunch"},
-        {"url": "https://zenn.dev/topics/ai/feed", "name": "Zenn"}
-    ],
-    "ガジェット・ハードウェア": [
-        {"url": "https://www.gizmodo.jp/index.xml", "name": "Gizmodo Japan"},
-        {"url": "https://hnrss.org/newest?q=Hardware+OR+Gadget&points=50", "name": "Hacker News Hardware"},
-        {"url": "https://japanese.engadget.com/rss.xml", "name": "Engadget"}
-    ],
-    "ビジネス・経済": [
-        {"url": "https://hnrss.org/newest?q=Business+OR+Market+OR+Economy&points=100", "name": "HN Business"},
-        {"url": "https://news.google.com/rss/search?q=%E3%83%86%E3%82%AF%E3%83%8E%E3%83%AD%E3%82%B8%E3%83%BC+%E4%BA%8B%E6%A5%AD&hl=ja&gl=JP&ceid=JP:ja", "name": "Google News Biz"}
-    ],
-    "ライフハック・仕事術": [
-        {"url": "https://b.hatena.ne.jp/q/%E3%83%A9%E3%82%A4%E3%83%95%E3%83%8F%E3%83%83%E3%82%AF?sort=recent&safe=on&mode=rss", "name": "Hatena Lifehack"},
-        {"url": "https://lifehacker.com/feed/rss", "name": "Lifehacker"}
-    ],
-    "サイエンス・未来予測": [
-        {"url": "https://hnrss.org/newest?q=Science+OR+Space+OR+Physics&points=100", "name": "HN Science"},
-        {"url": "https://wired.jp/rss/index.xml", "name": "WIRED Japan"}
-    ]
-}
+# Heavy dependencies load on first use (CPU stages live in cpu_stages)
+feedparser = lazy("feedparser")
+dateutil_parser = lazy("dateutil.parser")
+pytz = lazy("pytz")
 
 def parse_date(date_string):
     if not date_string:
@@ -67,111 +40,32 @@ def parse_date(date_string):
     except Exception: pass
     return datetime.now()
 
+def translate_tags(words, is_english):
+    if not is_english:
+        return words
+    translated = translate_many(words)
+    return [translated.get(w, w) for w in words]
+
 def extract_tags(text, num_tags=3):
     """
     Extracts 3-5 core noun keywords from the text, ignoring stopwords.
     Translates them to Japanese if necessary.
     """
-    if not text or len(text) < 10:
-        return []
-        
-    # Standardize
-    translator = GoogleTranslator(source='auto', target='ja')
-    
-    # Try to extract English words if it's english text
-    is_english = len([char for char in text[:500] if ord(char) < 128]) / min(500, len(text)) > 0.8
-    lang = 'english' if is_english else None
-    
-    if lang == 'english':
-        tokens = nltk.word_tokenize(text)
-        stop_words = set(stopwords.words('english') + list(string.punctuation) + ['The', 'A', 'An', 'It', 'This', 'That'])
-        
-        # Focus on capitalized words (proper nouns/products) or long words
-        candidates = [w for w in tokens if w not in stop_words and len(w) > 3 and not w.isnumeric()]
-        
-        # Super simple frequency distribution to find the 'core' themes
-        freq = nltk.FreqDist(candidates)
-        top_words = [word for word, count in freq.most_common(num_tags)]
-        
-        tags_ja = []
-        for w in top_words:
-            try:
-                tags_ja.append(translator.translate(w))
-            except:
-                tags_ja.append(w)
-        return tags_ja
-    else:
-        # For Japanese text, since we don't have MeCab installed, we'll try a rough heuristic:
-        # Extract alphanumeric English words from the Japanese text (e.g. "Apple", "GPT-4")
-        tokens = nltk.word_tokenize(text)
-        english_ish = [w for w in tokens if w.isalnum() and len(w) > 2 and any(c.isalpha() for c in w) and all(ord(c) < 128 for c in w)]
-        freq = nltk.FreqDist(english_ish)
-        return [word for word, count in freq.most_common(num_tags)]
+    return translate_tags(*tag_words(clean(text or ''), num_tags))
 
-def process_article(entry, source_name, cat):
-    title = entry.get('title', 'No Title')
-    link = entry.get('link') or entry.get('url') or getattr(entry, 'link', '')
-    
-    published = entry.get('published', entry.get('pubDate', entry.get('updated', entry.get('dc:date', entry.get('date', '')))))
-    pub_date = parse_date(published)
-    
-    # ID Generation
-    uid = hashlib.md5(link.encode('utf-8')).hexdigest()
+def entry_link(entry):
+    return entry.get('link') or entry.get('url') or getattr(entry, 'link', '')
 
-    # Base translation
-    translator = GoogleTranslator(source='auto', target='ja')
+def article_id(link):
+    return hashlib.md5(link.encode('utf-8')).hexdigest()
+
+def translate_title(title):
     try:
-        title_ja = translator.translate(title) if len(title) > 0 and ord(title[0]) < 128 else title
+        return translate(title) if starts_ascii(title) else title
     except:
-        title_ja = title
-        
-    # Download content via trafilatura for the core sentence
-    downloaded = trafilatura.fetch_url(link)
-    core_sentence = "内容を抽出できませんでした。リンク元をご確認ください。"
-    tags = []
-    read_time = 1
-    
-    if downloaded:
-        text = trafilatura.extract(downloaded)
-        if text:
-            # Idea C: Basic cleanup
-            clean_lines = [line.strip() for line in text.split('\n') if len(line.strip()) > 15 and not any(nw in line.lower() for nw in ['cookie', 'subscribe', 'log in', 'sign up', 'read more'])]
-            if clean_lines:
-                clean_text = ' '.join(clean_lines)
-                
-                # Estimate read time based on total extracted text
-                # average reading speed in Japanese is around 400 chars/minute
-                read_time = max(1, round(len(clean_text) / 400))
-                
-                # Lead-1 approach (Idea D variation: Take the first substantial sentence)
-                sentences = nltk.sent_tokenize(clean_text)
-                if sentences:
-                    lead_sentence = sentences[0]
-                    # Translate if english
-                    is_english = len([char for char in lead_sentence if ord(char) < 128]) / len(lead_sentence) > 0.8
-                    if is_english:
-                        try:
-                            core_sentence = translator.translate(lead_sentence)
-                        except:
-                            core_sentence = lead_sentence
-                    else:
-                        core_sentence = lead_sentence
-            
-            # Extract tags from the cleaned text
-            tags = extract_tags(text, 3)
-            
-    # Fallback to description if trafilatura fails entirely and we have an RSS summary
-    if core_sentence.startswith("内容を") and entry.get('summary'):
-        summary = BeautifulSoup(entry.summary, "html.parser").get_text(separator=' ', strip=True)
-        if summary:
-            sentences = nltk.sent_tokenize(summary)
-            if sentences:
-                s = sentences[0]
-                try:
-                    core_sentence = translator.translate(s) if ord(s[0]) < 128 else s
-                except:
-                    core_sentence = s
+        return title
 
+def build_article(uid, cat, title_ja, tags, core_sentence, source_name, read_time, link, pub_date):
     # Ensure tags isn't completely empty for UI aesthetic
     if not tags:
         # Fallback to category tag or source name
@@ -207,18 +101,106 @@ def process_article(entry, source_name, cat):
         "timestamp": pub_date.timestamp()
     }
 
-def fetch_category(cat, feeds):
+NO_CONTENT = "内容を抽出できませんでした。リンク元をご確認ください。"
+
+async def analyze_entry(entry):
+    """
+    Network and CPU stages of one entry, nothing translated yet.
+    Returns (lead_sentence, read_time, tag_words, texts_to_translate).
+    """
+    # Stages that miss their deadline degrade to the RSS summary below
+    downloaded = await within("download", hedged(fetch_html, entry_link(entry)))
+    lead_sentence = None
+    words = []
+    read_time = 1
+    to_translate = []
+
+    if downloaded:
+        # Extraction, lead sentence and tag keywords are CPU work: one round-trip to the process pool
+        analysis = await within("analyze", run_cpu(analyze_html, downloaded, 3))
+        if analysis:
+            lead_sentence, read_time, words, tags_are_english = analysis
+            if lead_sentence and is_english(lead_sentence):
+                to_translate.append(lead_sentence)
+            if tags_are_english:
+                to_translate.extend(words)
+
+    # Fallback to description if trafilatura fails entirely and we have an RSS summary
+    if not lead_sentence and entry.get('summary'):
+        lead_sentence = await within("fallback", run_cpu(summary_lead, entry.summary), budget=False)
+        if starts_ascii(lead_sentence):
+            to_translate.append(lead_sentence)
+    return lead_sentence, read_time, words, to_translate
+
+async def enrich_articles(items, cat):
+    """
+    Enriches [(entry, source_name)]. Downloads and CPU stages run per entry on the
+    shared executors; then the titles, lead sentences and tag keywords of all of them
+    go to translate_many together (packed into a few requests instead of ~5 per article).
+    Returns one article, or the exception that stopped it, per item.
+    """
+    analyses = await asyncio.gather(*[analyze_entry(entry) for entry, _ in items], return_exceptions=True)
+
+    texts = []
+    for (entry, _), analysis in zip(items, analyses):
+        title = entry.get('title', 'No Title')
+        if starts_ascii(title):
+            texts.append(title)
+        if not isinstance(analysis, Exception):
+            texts.extend(analysis[3])
+    # Past the deadline, articles keep their original (untranslated) strings
+    translated = await within("translate", run_translation(translate_many, texts), {}) if texts else {}
+
+    articles = []
+    for (entry, source_name), analysis in zip(items, analyses):
+        if isinstance(analysis, Exception):
+            articles.append(analysis)
+            continue
+        lead_sentence, read_time, words, needed = analysis
+        title = entry.get('title', 'No Title')
+        link = entry_link(entry)
+        published = entry.get('published', entry.get('pubDate', entry.get('updated', entry.get('dc:date', entry.get('date', '')))))
+        # Strings that failed to translate (or never needed it) stay as they are
+        core_sentence = translated.get(lead_sentence, lead_sentence) if lead_sentence else NO_CONTENT
+        tags = [translated.get(w, w) for w in words]
+        article = build_article(article_id(link), cat, translated.get(title, title), tags, core_sentence,
+                                source_name, read_time, link, parse_date(published))
+        # Untranslated title / lead (translation failure or deadline): published as is,
+        # but never stored for reuse, so the next run enriches it again
+        if (starts_ascii(title) and title not in translated) or (lead_sentence in needed and lead_sentence not in translated):
+            article["degraded"] = True
+        elif core_sentence == NO_CONTENT:
+            # Pages that can't be downloaded (redirects, paywalls) rarely start working:
+            # stored like the rest, but only reused until retry_after
+            article["retry_after"] = time.time() + article_store.RETRY_AFTER
+        articles.append(article)
+    return articles
+
+async def enrich_article(entry, source_name, cat):
+    article = (await enrich_articles([(entry, source_name)], cat))[0]
+    if isinstance(article, Exception):
+        raise article
+    return article
+
+def process_article(entry, source_name, cat):
+    return asyncio.run(enrich_article(entry, source_name, cat))
+
+async def fetch_feed_entries(feed_info):
+    try:
+        entries = await within("feed", run_blocking(fetch_entries, feed_info["url"]), [])
+        # We pull up to 10 candidates per feed
+        return [(entry, feed_info["name"]) for entry in entries[:10]]
+    except Exception as e:
+        print(f"Error fetching {feed_info['name']}: {e}")
+        return []
+
+async def curate_category(cat, feeds, known=None):
+    known = known if known is not None else {}
     all_cat_articles = []
     
-    for feed_info in feeds:
-        try:
-            feed = feedparser.parse(feed_info["url"])
-            if feed.entries:
-                # We pull up to 10 candidates per feed
-                for entry in feed.entries[:10]:
-                    all_cat_articles.append((entry, feed_info["name"]))
-        except Exception as e:
-            print(f"Error fetching {feed_info['name']}: {e}")
+    # All feeds of the category are fetched concurrently on the shared executor
+    for entries in await asyncio.gather(*[fetch_feed_entries(f) for f in feeds]):
+        all_cat_articles.extend(entries)
             
     # Sort candidates by date, newest first
     def get_ts(item):
@@ -227,47 +209,144 @@ def fetch_category(cat, feeds):
         
     all_cat_articles.sort(key=get_ts, reverse=True)
     
-    # We only process the Absolute Top 5 candidates per category
-    top_candidates = all_cat_articles[:5]
+    # Collapse near-duplicate stories (same news via several feeds) before anything is
+    # downloaded or translated; the other feeds become alternate sources
+    if dedup.TRANSLATED_TITLES:
+        # One packed request warms the cache for every title cluster() will translate
+        titles = [dedup.clean_title(c[0].get('title', '')) for c in all_cat_articles]
+        await within("translate", run_translation(translate_many, [t for t in titles if starts_ascii(t)]))
+    clusters = await within("dedup", run_blocking(
+        dedup.cluster, all_cat_articles,
+        lambda c: c[0].get('title', ''), lambda c: c[0].get('summary', ''), lambda c: entry_link(c[0]),
+        translate_title if dedup.TRANSLATED_TITLES else None
+    ))
+    if clusters is None:
+        # Out of time: every candidate stands alone
+        clusters = [(item, []) for item in all_cat_articles]
+    
+    # We only process the Absolute Top 5 stories per category
+    top_candidates = clusters[:5]
     
     processed = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [executor.submit(process_article, item[0], item[1], cat) for item in top_candidates]
-        for f in as_completed(futures):
-            res = f.result()
-            if res:
-                processed.append(res)
+    pending = []
+    for (entry, source_name), duplicates in top_candidates:
+        alt_sources = dedup.alt_sources(duplicates, lambda c: c[1], lambda c: entry_link(c[0]))
+        # Incremental mode: reuse the enriched article if we already processed this link
+        cached = known.get(article_id(entry_link(entry)))
+        if cached and cached.get("category") == cat and article_store.reusable(cached):
+            metrics.count("article_store.reused")
+            processed.append(dict(cached, alt_sources=alt_sources))
+        else:
+            pending.append((entry, source_name, alt_sources))
+    metrics.count("article_store.enriched", len(pending))
+            
+    results = await enrich_articles([(entry, source_name) for entry, source_name, _ in pending], cat)
+    for (_, _, alt_sources), res in zip(pending, results):
+        if isinstance(res, Exception):
+            print(f"   [WARN] {cat}: article failed: {res}")
+        elif res:
+            res["alt_sources"] = alt_sources
+            processed.append(res)
                 
     # Re-sort to maintain chronological order in the top 5
     processed.sort(key=lambda x: x["timestamp"], reverse=True)
     return processed
 
-def run_curation():
+def fetch_category(cat, feeds, known=None):
+    return asyncio.run(curate_category(cat, feeds, known))
+
+async def curate_all(known, on_category_done=None, progress=None):
+    results_by_cat = {}
+    # Run-level time budget shared by every category branch (pipeline.RUN_BUDGET)
+    start_budget()
+
+    async def run_one(cat, feeds):
+        try:
+            return cat, await curate_category(cat, feeds, known), None
+        except Exception as e:
+            return cat, None, e
+
+    # Every category is one branch of the same task graph; none waits for the others
+    tasks = [asyncio.ensure_future(run_one(cat, feeds)) for cat, feeds in CATEGORIES.items()]
+    for next_done in asyncio.as_completed(tasks):
+        cat_name, res, error = await next_done
+        if error is not None:
+            print(f"   [ERROR] Category {cat_name} failed: {error}")
+            if progress:
+                progress(cat_name, "failed", str(error))
+            continue
+        results_by_cat[cat_name] = res
+        print(f"   [DONE] {cat_name}: {len(res)} articles generated.")
+        if progress:
+            progress(cat_name, "done", len(res))
+        if on_category_done:
+            on_category_done(results_by_cat)
+
+    final_output = []
+    for res in results_by_cat.values():
+        final_output.extend(res)
+    return final_output
+
+def republish(previous, results_by_cat, partial=False, sidecars=None):
+    """
+    Publishes previous with the articles of the categories in results_by_cat replaced.
+    Returns the new snapshot version.
+    """
+    articles = [a for a in previous if a.get("category") not in results_by_cat]
+    for res in results_by_cat.values():
+        articles.extend(res)
+    articles.sort(key=lambda x: x["timestamp"], reverse=True)
+    search_index.annotate(articles)
+    sidecars = dict(sidecars or {}, index=search_index.build_index(articles))
+    return snapshot_store.publish(articles, partial=partial, sidecars=sidecars)
+
+def run_curation(incremental=True, progress=None):
+    """
+    progress: optional callback(category, state, detail), e.g. RefreshJob.update.
+    """
     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting Zero-Load Generation...") # Generating zero-load data
+    metrics.start_run()
+    if progress:
+        for cat in CATEGORIES:
+            progress(cat, "running", None)
     
-    final_output = []
+    # Previously enriched articles (by id) that can be reused without any network work
+    store = article_store.load_store()
+    known = store if incremental else {}
+    _, previous = snapshot_store.load_current()
+
+    def publish_partial(results_by_cat):
+        # Streaming publication: finished categories replace their old articles right
+        # away, so main.py can show them without waiting for the slowest category
+        republish(previous, results_by_cat, partial=True)
     
-    with ThreadPoolExecutor(max_workers=len(CATEGORIES)) as cat_executor:
-        future_to_cat = {cat_executor.submit(fetch_category, cat, feeds): cat for cat, feeds in CATEGORIES.items()}
-        for future in as_completed(future_to_cat):
-            cat_name = future_to_cat[future]
-            try:
-                res = future.result()
-                final_output.extend(res)
-                print(f"   [DONE] {cat_name}: {len(res)} articles generated.")
-            except Exception as e:
-                print(f"   [ERROR] Category {cat_name} failed: {e}")
+    final_output = asyncio.run(curate_all(known, on_category_done=publish_partial, progress=progress))
                 
     # Sort global output
     final_output.sort(key=lambda x: x["timestamp"], reverse=True)
     
-    # Save to JSON
-    os.makedirs("data", exist_ok=True)
-    output_path = os.path.join("data", "daily_curation.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(final_output, f, ensure_ascii=False, indent=4)
+    # Save to JSON (new complete version in the snapshot store) with its search index
+    # and the run's metrics (+ profile with AINEWS_PROFILE=1)
+    search_index.annotate(final_output)
+    sidecars = metrics.finish_run()
+    sidecars["index"] = search_index.build_index(final_output)
+    version = snapshot_store.publish(final_output, sidecars=sidecars)
         
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Curation complete! Saved {len(final_output)} articles to {output_path}.")
+    # Remember everything we enriched so the next run only processes new candidates
+    article_store.remember(store, final_output)
+    article_store.save_store(store)
+    save_cache()
+        
+    degraded = sum(n for name, n in sidecars["metrics"]["counters"].items() if name.startswith("deadline."))
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Curation complete! Saved {len(final_output)} articles as snapshot v{version}."
+          + (f" ({degraded} stages degraded by deadlines)" if degraded else ""))
 
 if __name__ == "__main__":
-    run_curation()
+    import sys
+    if "schedule" in sys.argv[1:]:
+        # Long-running daemon with per-feed refresh cadence (see scheduler.py)
+        import scheduler
+        scheduler.run(once="--once" in sys.argv)
+    else:
+        # --full forces re-enrichment of every candidate (ignores the article store)
+        run_curation(incremental="--full" not in sys.argv)
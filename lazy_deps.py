@@ -0,0 +1,143 @@
+import importlib
+import os
+import sys
+import threading
+import time
+
+# Fast-start support for the curation modules.
+# - heavy dependencies (trafilatura, sumy, nltk, deep_translator, bs4, dateutil,
+#   feedparser) are wrapped in LazyModule proxies and only imported by the first
+#   stage that actually touches them
+# - NLTK data (punkt, punkt_tab, stopwords) is resolved from the bundled ./nltk_data
+#   directory; with AINEWS_FAST_START=1 it is never downloaded at runtime
+# - `python lazy_deps.py report` measures import times against IMPORT_BUDGET
+FAST_START = os.environ.get("AINEWS_FAST_START", "0") == "1"
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+}
+
+# Seconds allowed for importing an entry-point module (heavy deps excluded)
+IMPORT_BUDGET = 0.5
+
+# name -> seconds spent importing it (first use only)
+IMPORT_TIMES = {}
+
+_lock = threading.RLock()
+_nltk_ready = False
+# Set once the NLTK data turned out to be missing, so later stages fail fast
+_nltk_error = None
+
+class LazyModule:
+    def __init__(self, name, on_load=None):
+        self._name = name
+        self._on_load = on_load
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    IMPORT_TIMES[self._name] = time.perf_counter() - start
+                    if self._on_load:
+                        self._on_load(module)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+def lazy(name, on_load=None):
+    return LazyModule(name, on_load)
+
+def ensure_nltk_data(_module=None):
+    """
+    Makes the bundled NLTK data directory visible to nltk and checks the resources
+    we need. Downloads missing ones into the bundle unless FAST_START is set.
+    Raises LookupError if a resource is still missing afterwards (offline).
+    """
+    global _nltk_ready, _nltk_error
+    if _nltk_ready:
+        return
+    with _lock:
+        if _nltk_ready:
+            return
+        if _nltk_error:
+            raise LookupError(_nltk_error)
+        nltk = importlib.import_module("nltk")
+        if NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        missing = _missing_nltk_data(nltk)
+        if missing and not FAST_START:
+            for name in missing:
+                # download() only reports failures through its return value / log
+                nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True)
+            missing = _missing_nltk_data(nltk)
+        if missing:
+            _nltk_error = (f"NLTK data {', '.join(missing)} not found in {NLTK_DATA_DIR} or NLTK_DATA"
+                           f"{' and could not be downloaded' if not FAST_START else ''}"
+                           " (run: python lazy_deps.py bundle-nltk)")
+            raise LookupError(_nltk_error)
+        _nltk_ready = True
+
+def _missing_nltk_data(nltk):
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+def bundle_nltk():
+    """
+    Downloads the NLTK resources missing from the bundle. Returns False if any is
+    still missing afterwards.
+    """
+    nltk = importlib.import_module("nltk")
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    for name in _missing_nltk_data(nltk):
+        nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True)
+    missing = _missing_nltk_data(nltk)
+    if missing:
+        print(f"NLTK data could not be downloaded: {', '.join(missing)}")
+        return False
+    print(f"NLTK data bundled into {NLTK_DATA_DIR}")
+    return True
+
+def report():
+    """
+    Prints entry-point import times (budgeted) and the cost of each heavy dependency.
+    Returns False if an entry point exceeds IMPORT_BUDGET.
+    """
+    within_budget = True
+    for entry in ("generate_curation", "extractor"):
+        start = time.perf_counter()
+        importlib.import_module(entry)
+        elapsed = time.perf_counter() - start
+        status = "OK" if elapsed <= IMPORT_BUDGET else "OVER BUDGET"
+        within_budget = within_budget and elapsed <= IMPORT_BUDGET
+        print(f"{entry:<24} {elapsed * 1000:8.1f} ms  [{status}, budget {IMPORT_BUDGET * 1000:.0f} ms]")
+
+    for name in ("feedparser", "trafilatura", "nltk", "sumy.summarizers.lsa", "deep_translator", "bs4", "dateutil.parser"):
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            print(f"  {name:<22} {(time.perf_counter() - start) * 1000:8.1f} ms (loaded on first use)")
+        except ImportError as e:
+            print(f"  {name:<22} not installed ({e})")
+    return within_budget
+
+if __name__ == "__main__":
+    # python lazy_deps.py [report | bundle-nltk]
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    if command == "bundle-nltk":
+        sys.exit(0 if bundle_nltk() else 1)
+    else:
+        sys.exit(0 if report() else 1)
@@ -4,6 +4,11 @@ import hashlib
 import os
 import time
 import streamlit.components.v1 as components
+from collections import namedtuple
+import snapshot_store
+import payload_store
+import search_index
+import bluesky_trends
 
 # ==========================================
 # Native App Engine Configuration (V8)
@@ -17,20 +22,18 @@ st.set_page_config(
 )
 
 import threading
+import refresh_job
+import scheduler
 
-flag_path = os.path.join("data", "is_updating.flag")
+# Longest a session blocks in the update poller before rerunning
+POLL_SECONDS = 30
 
 # Ensure data directory exists (Streamlit Cloud fresh boots might miss it)
 os.makedirs("data", exist_ok=True)
 
-# Clean up ghost flags older than 10 minutes (crash recovery)
-if os.path.exists(flag_path) and time.time() - os.path.getmtime(flag_path) > 600:
-    try:
-        os.remove(flag_path)
-    except:
-        pass
-
-is_updating_flag = os.path.exists(flag_path)
+# A refresh is running if some process holds the refresh lock and its heartbeat is fresh
+# (dead jobs are detected from the heartbeat, no fixed ghost-flag timeout)
+is_updating_flag = refresh_job.is_running()
 
 # Native Streamlit Button for Manual Refresh (bypasses iframe sandbox)
 st.markdown("""
@@ -78,40 +81,46 @@ if 'articles' not in st.session_state:
     
 # ZERO-LOAD: Instantly load from pre-compiled JSON instead of web scraping
 # Hybrid Cloud Approach: Generate it if it doesn't exist or is older than 6 hours
-json_path = os.path.join("data", "daily_curation.json")
+# (checked on the snapshot store's CURRENT pointer, no JSON parsing needed)
+snapshot_mtime = snapshot_store.current_mtime()
 
 is_expired = False
-if os.path.exists(json_path):
+if snapshot_mtime:
     # 6 hours TTL = 21600 seconds
-    file_age = time.time() - os.path.getmtime(json_path)
+    file_age = time.time() - snapshot_mtime
     if file_age > 21600:
         is_expired = True
 
-if (FORCE_REFRESH or is_expired or not os.path.exists(json_path)) and not is_updating_flag:
-    os.makedirs(os.path.dirname(flag_path), exist_ok=True)
-    open(flag_path, 'w').close()
+# With the scheduler daemon running (python generate_curation.py schedule) page views
+# never scrape: the refresh button only asks the daemon for an immediate pass
+scheduler_active = scheduler.is_active()
+if FORCE_REFRESH and scheduler_active:
+    scheduler.request_refresh()
+
+if (FORCE_REFRESH or is_expired or not snapshot_mtime) and not is_updating_flag and not scheduler_active:
+    # Atomic across sessions and Streamlit worker processes: only one caller gets the job
+    job = refresh_job.try_start()
     is_updating_flag = True
     
-    def background_update():
-        try:
-            from generate_curation import run_curation
-            run_curation()
-        except Exception as e:
-            print(f"Background Update Error: {e}")
-        finally:
-            if os.path.exists(flag_path):
-                try:
-                    os.remove(flag_path)
-                except:
-                    pass
-
-    t = threading.Thread(target=background_update, daemon=True)
-    t.start()
+    if job:
+        def background_update():
+            error = None
+            try:
+                from generate_curation import run_curation
+                run_curation(progress=job.update)
+            except Exception as e:
+                error = e
+                print(f"Background Update Error: {e}")
+            finally:
+                job.finish(error)
+
+        t = threading.Thread(target=background_update, daemon=True)
+        t.start()
     
 # Check if we just finished updating to trigger the success toast
 if not is_updating_flag and st.session_state.get('was_updating_flag', False):
     just_updated_flag = True
-    st.cache_data.clear()
+    # No cache to clear: the cached snapshot and document are keyed by snapshot version
     if 'articles' in st.session_state:
         del st.session_state.articles
 else:
@@ -119,12 +128,39 @@ else:
 
 st.session_state['was_updating_flag'] = is_updating_flag
 
-# Load the JSON normally (0.1s Zero-Load state)
-try:
-    with open(json_path, 'r', encoding='utf-8') as f:
-        st.session_state.articles = json.load(f)
-except Exception:
-    st.session_state.articles = []
+# With static serving enabled (.streamlit/config.toml) the data is published as
+# content-hashed, precompressed static payloads that the browser fetches and
+# revalidates via ETag, instead of being inlined into every rendered document.
+# ?inline=1 is where the frontend falls back to when it could not fetch a payload.
+STATIC_PAYLOADS = bool(st.get_option("server.enableStaticServing")) and st.query_params.get("inline") != "1"
+# Payload URLs are absolute so they also resolve under server.baseUrlPath
+_base_path = (st.get_option("server.baseUrlPath") or "").strip("/")
+APP_ROOT = f"/{_base_path}/" if _base_path else "/"
+
+# Process-wide snapshot cache: the parsed articles and their escaped JSON are built
+# once per snapshot version and shared (read-only) by every session and rerun.
+SharedSnapshot = namedtuple("SharedSnapshot", ["version", "articles", "articles_json", "index_json", "payload_url"])
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_shared_snapshot(version, static_payloads):
+    articles = snapshot_store.load_version(version)
+    # The search index is emitted by the curation run; rebuild it for older snapshots
+    index = snapshot_store.load_sidecar(version, "index")
+    if index is None or any("search_text" not in a for a in articles):
+        search_index.annotate(articles)
+        index = search_index.build_index(articles)
+    # Need to replace some html characters to safely put in script tag
+    articles_json = json.dumps(articles).replace("</", "<\\/")
+    index_json = json.dumps(index).replace("</", "<\\/")
+    payload_url = None
+    if static_payloads:
+        payload_url = APP_ROOT + payload_store.publish_payload("articles", json.dumps({"articles": articles, "index": index}, ensure_ascii=False, separators=(',', ':')))
+    return SharedSnapshot(version, tuple(articles), articles_json, index_json, payload_url)
+
+# Load the current snapshot (0.1s Zero-Load state, never a torn read)
+snapshot_version = snapshot_store.current_version()
+shared_snapshot = load_shared_snapshot(snapshot_version, STATIC_PAYLOADS)
+st.session_state.articles = shared_snapshot.articles
 
 # ---------------------------------------------------------
 # UI Overhaul Hack:
@@ -159,60 +195,34 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Serialize data for JS injection
-# Need to replace some html characters to safely put in script tag
-articles_json = json.dumps(st.session_state.articles).replace("</", "<\\/")
+# Bluesky SNS Trends are fetched server-side (avoids CORS & Auth blocks) by a background
+# refresher; the page only reads the last good copy from disk and never waits on the API.
+bluesky_trends.start_background_refresh()
 
-# Fetch Bluesky SNS Trends server-side to avoid CORS blocks & Auth blocks
-@st.cache_data(ttl=300) # Cache for 5 minutes
-def fetch_bluesky_sns_trends():
-    import urllib.request
-    import urllib.parse
-    
-    # searchPosts API requires auth. We use getFeed on a known Japanese News Custom Feed as a public unauthenticated workaround.
-    # "ニュース（日本語）" Feed DID
-    feed_uri = urllib.parse.quote("at://did:plc:ssebkmhtxgk33r67ggkfl7xr/app.bsky.feed.generator/aaaajtub7bar2")
-    # Fetch 100 recent posts from the news feed to ensure we find enough AI related posts
-    url = f"https://public.api.bsky.app/xrpc/app.bsky.feed.getFeed?feed={feed_uri}&limit=100"
-    
-    keywords = ["AI", "ChatGPT", "LLM", "OpenAI", "生成AI", "人工知能"]
-    ai_posts = []
-    
-    try:
-        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-        with urllib.request.urlopen(req) as response:
-            content = response.read().decode()
-            data = json.loads(content)
-            feed_items = data.get('feed', [])
-            
-            # Extract actual posts and filter by AI keywords
-            for item in feed_items:
-                post = item.get('post', {})
-                record = post.get('record', {})
-                text = record.get('text', '')
-                
-                # Simple keyword matching
-                if any(k.lower() in text.lower() for k in keywords):
-                    ai_posts.append(post)
-                    
-            # Fallback if too few filtered results: just return the latest news
-            if len(ai_posts) < 3:
-                # If we couldn't find enough AI specific news, just return general tech/news trends to avoid empty state
-                return [item.get('post') for item in feed_items[:25]]
-                
-            return ai_posts[:25]
-            
-    except Exception as e:
-        print("Bluesky backend fetch error:", e)
-        return []
+@st.cache_resource(max_entries=4, show_spinner=False)
+def bluesky_payload(version, static_payloads):
+    # Serialized once per refreshed copy instead of on every rerun
+    posts = bluesky_trends.load_posts()
+    bluesky_posts_json = json.dumps(posts).replace("</", "<\\/")
+    bluesky_url = None
+    if static_payloads:
+        bluesky_url = APP_ROOT + payload_store.publish_payload("bluesky", json.dumps(posts, ensure_ascii=False, separators=(',', ':')))
+    return bluesky_posts_json, hashlib.md5(bluesky_posts_json.encode('utf-8')).hexdigest(), bluesky_url
 
-bluesky_posts_list = fetch_bluesky_sns_trends()
-bluesky_posts_json = json.dumps(bluesky_posts_list).replace("</", "<\\/")
+bluesky_posts_json, bluesky_key, bluesky_url = bluesky_payload(bluesky_trends.current_version(), STATIC_PAYLOADS)
 
 # ==========================================
 # The Embedded Frontend App (Tailwind CSS + Vanilla JS)
+# Rendered once per (snapshot version, SNS payload, update flags) and shared by all sessions;
+# the underscore arguments are excluded from Streamlit's cache-key hashing.
 # ==========================================
-html_template = f"""
+@st.cache_resource(max_entries=16, show_spinner=False)
+def render_document(snapshot_version, bluesky_key, is_updating_flag, just_updated_flag, refresh_progress, articles_url, bluesky_url, _articles_json, _index_json, _bluesky_posts_json):
+    # Data is only inlined when it is not available as a static payload
+    articles_json = '[]' if articles_url else _articles_json
+    index_json = 'null' if articles_url else _index_json
+    bluesky_posts_json = '[]' if bluesky_url else _bluesky_posts_json
+    return f"""
 <!DOCTYPE html>
 <html lang="ja">
 <head>
@@ -328,18 +338,23 @@ html_template = f"""
 
     <script>
         // 1. Data Initialization
-        const articles = {articles_json};
+        // Inlined only when static serving is off; otherwise loaded from the static payload
+        let articles = {articles_json};
+        let searchIndex = {index_json};
+        const articlesUrl = {json.dumps(articles_url)};
         
         const isUpdating = {'true' if is_updating_flag else 'false'};
         const justUpdated = {'true' if just_updated_flag else 'false'};
         
         // Load bookmarks, read status, and muted tags from local storage
-        let savedIds = JSON.parse(localStorage.getItem('mySavedNewsIds')) || [];
-        let readIds = JSON.parse(localStorage.getItem('myReadNewsIds')) || [];
-        let mutedTags = JSON.parse(localStorage.getItem('myMutedTags')) || [];
+        // Kept as Sets for O(1) lookups; persisted as arrays
+        let savedIds = new Set(JSON.parse(localStorage.getItem('mySavedNewsIds')) || []);
+        let readIds = new Set(JSON.parse(localStorage.getItem('myReadNewsIds')) || []);
+        let mutedTags = new Set(JSON.parse(localStorage.getItem('myMutedTags')) || []);
         
         // SNS State
         let bskyPosts = {bluesky_posts_json};
+        const bskyUrl = {json.dumps(bluesky_url)};
         let isFetchingBskey = false;
 
         
@@ -360,7 +375,7 @@ html_template = f"""
         
         // 1. Search Bar Event
         searchInput.addEventListener('input', (e) => {{
-            searchQuery = e.target.value.toLowerCase();
+            searchQuery = normalizeText(e.target.value);
             renderFeed(); // Instantly update without server roundtrip!
         }});
         
@@ -446,28 +461,28 @@ html_template = f"""
             event.preventDefault();
             event.stopPropagation();
             
-            const index = savedIds.indexOf(id);
-            if (index > -1) {{
-                savedIds.splice(index, 1); // Remove
+            if (savedIds.has(id)) {{
+                savedIds.delete(id); // Remove
             }} else {{
-                savedIds.push(id); // Add
+                savedIds.add(id); // Add
             }}
             
             // save back to browser storage
-            localStorage.setItem('mySavedNewsIds', JSON.stringify(savedIds));
+            localStorage.setItem('mySavedNewsIds', JSON.stringify([...savedIds]));
             
-            // Re-render instantly based on context
+            // Per-card patch on the cached node (it may currently be outside the rendered window);
+            // always done, since other tabs reuse the same node later
+            const node = cardNodes.get(id);
+            const btn = node && node.querySelector(`button[data-id="${{id}}"]`);
+            if (btn) {{
+                const isSaved = savedIds.has(id);
+                btn.innerHTML = isSaved 
+                    ? `<svg class="w-5 h-5 text-yellow-500 drop-shadow-md" fill="currentColor" viewBox="0 0 20 20"><path d="M5 4a2 2 0 012-2h6a2 2 0 012 2v14l-5-2.5L5 18V4z"></path></svg>`
+                    : `<svg class="w-5 h-5 text-gray-500 hover:text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 5a2 2 0 012-2h10a2 2 0 012 2v16l-7-3.5L5 21V5z"></path></svg>`;
+            }}
+            // The saved list itself changed
             if (currentTab === 'saved') {{
                 renderFeed();
-            }} else {{
-                // Optimistic UI update for the single button clicked to prevent flashing
-                const btn = document.querySelector(`button[data-id="${{id}}"]`);
-                if (btn) {{
-                    const isSaved = savedIds.includes(id);
-                    btn.innerHTML = isSaved 
-                        ? `<svg class="w-5 h-5 text-yellow-500 drop-shadow-md" fill="currentColor" viewBox="0 0 20 20"><path d="M5 4a2 2 0 012-2h6a2 2 0 012 2v14l-5-2.5L5 18V4z"></path></svg>`
-                        : `<svg class="w-5 h-5 text-gray-500 hover:text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 5a2 2 0 012-2h10a2 2 0 012 2v16l-7-3.5L5 21V5z"></path></svg>`;
-                }}
             }}
         }}
         
@@ -478,14 +493,15 @@ html_template = f"""
         
         // 6. Read State Tracking
         function markAsRead(id) {{
-            if (!readIds.includes(id)) {{
-                readIds.push(id);
-                localStorage.setItem('myReadNewsIds', JSON.stringify(readIds));
+            if (!readIds.has(id)) {{
+                readIds.add(id);
+                localStorage.setItem('myReadNewsIds', JSON.stringify([...readIds]));
                 
 
-                // Optimistic visual update
-                const card = document.getElementById(`card-${{id}}`);
-                const dot = document.getElementById(`dot-${{id}}`);
+                // Optimistic visual update, patched on the cached card node
+                const node = cardNodes.get(id);
+                const card = node && node.querySelector(`#card-${{id}}`);
+                const dot = node && node.querySelector(`#dot-${{id}}`);
                 if(card) card.classList.add('opacity-50', 'grayscale-[30%]');
                 if(dot) dot.style.display = 'none';
             }}
@@ -496,23 +512,23 @@ html_template = f"""
             event.preventDefault();
             event.stopPropagation();
 
-            const article = articles.find(a => a.id === id);
+            const article = articles[positionById.get(id)];
             if (article && article.tags && article.tags.length > 0) {{
                 let newlyMuted = 0;
                 article.tags.forEach(t => {{
-                    if (!mutedTags.includes(t)) {{
-                        mutedTags.push(t);
+                    if (!mutedTags.has(t)) {{
+                        mutedTags.add(t);
                         newlyMuted++;
                     }}
                 }});
 
                 if (newlyMuted > 0) {{
-                    localStorage.setItem('myMutedTags', JSON.stringify(mutedTags));
+                    localStorage.setItem('myMutedTags', JSON.stringify([...mutedTags]));
                     showToast(`🚫 類似トピック（${{article.tags[0]}}等）をミュートしました`);
                 }}
 
                 // Immediately hide visually for smooth UX
-                const card = document.getElementById(`card-${{id}}`);
+                const card = cardNodes.get(id);
                 if (card) {{
                     card.style.opacity = '0';
                     card.style.transform = 'scale(0.95)';
@@ -627,10 +643,12 @@ html_template = f"""
             let filteredPosts = bskyPosts.filter(post => {{
                 const text = post.record?.text || '';
                 // If the post text contains any of the muted tags, filter it out
-                if (mutedTags.some(tag => text.includes(tag))) return false;
+                for (const tag of mutedTags) {{
+                    if (text.includes(tag)) return false;
+                }}
                 
                 // Also apply search query if active
-                if (searchQuery && !text.toLowerCase().includes(searchQuery)) return false;
+                if (searchQuery && !normalizeText(text).includes(searchQuery)) return false;
                 
                 return true;
             }});
@@ -701,6 +719,282 @@ html_template = f"""
             feedContainer.innerHTML = html;
         }}
 
+        // Card markup for a single article (materialized lazily by the virtual renderer)
+        function cardHtml(a) {{
+            const isSaved = savedIds.has(a.id);
+            const isRead = readIds.has(a.id);
+            const accentColor = getAccentColor(a.category);
+
+            const opacityClass = isRead ? 'opacity-50 grayscale-[30%] transition-all' : '';
+            const blueDot = isRead ? '' : `<span id="dot-${{a.id}}" class="inline-block w-2.5 h-2.5 bg-blue-500 rounded-full shadow-[0_0_8px_rgba(59,130,246,0.8)] ml-2 mb-0.5 animate-pulse"></span>`;
+
+            // Beautiful Pill Tags
+            const tagsHtml = (a.tags || []).map(t =>
+                `<span class="inline-flex items-center px-2 py-0.5 rounded text-[0.65rem] font-medium bg-[#58a6ff]/10 text-blue-400 border border-blue-500/20 mr-1.5 mb-2">${{t}}</span>`
+            ).join('');
+
+            // Core 1-Sentence Summary format
+            const summaryHtml = `<p class="text-[0.95rem] font-medium text-gray-300 leading-relaxed mt-3 mb-1 pl-3 border-l-2 border-[#58a6ff]/70">${{a.core_sentence || ''}}</p>`;
+
+            // Same story from other feeds (near-duplicates collapsed at curation time)
+            const altSources = a.alt_sources || [];
+            const altHtml = altSources.length
+                ? `<span title="${{altSources.map(s => s.source).join(', ')}}" class="text-[0.6rem] text-gray-500">+${{altSources.length}}件</span>`
+                : '';
+
+            // Beautiful Insight Display
+            const insightHtml = a.insight
+                ? `<p class="text-[0.85rem] font-semibold text-amber-200/90 mt-3 pt-2 border-t border-gray-700/50">${{a.insight}}</p>`
+                : '';
+
+            return `
+                <div id="card-${{a.id}}" class="relative bg-[#161b22] border border-gray-700/60 rounded-2xl overflow-hidden card-anim shadow-sm ${{opacityClass}}">
+                    <div class="absolute top-0 left-0 right-0 h-1" style="background-color: ${{accentColor}}"></div>
+
+                    <div class="p-4 pb-0">
+                        <!-- Source and Bookmark -->
+                        <div class="flex justify-between items-center mb-2.5">
+                            <div class="flex items-center gap-2">
+                                <span class="text-[0.65rem] font-bold text-gray-400 bg-white/5 border border-white/5 py-0.5 px-2 rounded uppercase tracking-wider">${{a.source}}</span>
+                                ${{altHtml}}
+                            </div>
+                            <button data-id="${{a.id}}" onclick="toggleBookmark('${{a.id}}', event)" class="p-2 -mr-2 -mt-2 rounded-full hover:bg-white/10 transition z-10 active:scale-90">
+                                ${{isSaved
+                                    ? `<svg class="w-[1.15rem] h-[1.15rem] text-yellow-500 drop-shadow-sm" fill="currentColor" viewBox="0 0 20 20"><path d="M5 4a2 2 0 012-2h6a2 2 0 012 2v14l-5-2.5L5 18V4z"></path></svg>`
+                                    : `<svg class="w-[1.15rem] h-[1.15rem] text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 5a2 2 0 012-2h10a2 2 0 012 2v16l-7-3.5L5 21V5z"></path></svg>`
+                                }}
+                            </button>
+                        </div>
+                        
+                        <a href="${{a.url}}" target="_blank" onclick="markAsRead('${{a.id}}')" class="block outline-none tap-highlight-transparent group hover:opacity-90 transition mt-3">
+                            <!-- Title and Tags -->
+                            <h2 class="text-[1.15rem] font-bold text-[#e6edf3] mb-2.5 leading-snug tracking-tight group-hover:text-blue-400 transition-colors">${{a.title_ja}}${{blueDot}}</h2>
+                            <div class="flex flex-wrap mb-2">
+                                ${{tagsHtml}}
+                            </div>
+                            
+                            <!-- Core 1-sentence summary & Insight -->
+                            ${{summaryHtml}}
+                            ${{insightHtml}}
+                        </a>
+                    </div>
+                    
+                    <!-- Actions -->
+                    <div class="px-4 py-3 bg-[#11151c] flex justify-between items-center border-t border-gray-800/80 mt-4">
+                        <span class="text-[0.7rem] text-gray-500 font-medium flex items-center gap-1.5 min-w-0 flex-shrink-0">
+                            <svg class="w-3.5 h-3.5 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4l3 3m6-3a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>
+                            <span class="truncate">約${{a.read_time_min || 1}}分</span>
+                        </span>
+                        <div class="flex items-center gap-2.5">
+                            <button onclick="muteArticle('${{a.id}}', event)" class="p-1.5 rounded-full text-gray-500/60 hover:text-red-400 hover:bg-white/5 transition active:scale-90" title="興味なし（関連タグをミュート）">
+                                <svg class="w-[1.1rem] h-[1.1rem]" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg>
+                            </button>
+                            <a href="${{a.url}}" target="_blank" onclick="markAsRead('${{a.id}}')" class="text-blue-400 text-[0.75rem] font-bold tracking-wide flex items-center gap-1.5 bg-[#58a6ff]/10 border border-[#58a6ff]/20 px-3.5 py-1.5 rounded-full hover:bg-[#58a6ff]/20 active:scale-95 transition flex-shrink-0">
+                                <span class="whitespace-nowrap">記事を読む</span>
+                                <svg class="w-3 h-3 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2.5" d="M14 5l7 7m0 0l-7 7m7-7H3"></path></svg>
+                            </a>
+                        </div>
+                    </div>
+                </div>
+            `;
+        }}
+
+        // --- Virtualized Feed Renderer --- //
+        // Only cards near the viewport are materialized. Card DOM nodes are cached by id and
+        // reused across search / tab / mute changes, and bookmark / read state is patched per card.
+        const CARD_ESTIMATE_PX = 300;
+        const OVERSCAN_PX = 800;
+        const cardNodes = new Map();   // id -> card wrapper element
+        const cardHeights = new Map(); // id -> measured height in px
+
+        function getCardNode(a) {{
+            let node = cardNodes.get(a.id);
+            if (!node) {{
+                node = document.createElement('div');
+                node.className = 'pb-4';
+                node.innerHTML = cardHtml(a);
+                cardNodes.set(a.id, node);
+            }}
+            return node;
+        }}
+
+        function resetCardCache() {{
+            cardNodes.clear();
+            cardHeights.clear();
+        }}
+
+        const virtualFeed = {{
+            items: [],
+            offsets: [0],
+            start: -1,
+            end: -1,
+            topSpacer: document.createElement('div'),
+            body: document.createElement('div'),
+            bottomSpacer: document.createElement('div'),
+
+            setItems(items) {{
+                this.items = items;
+                this.start = -1;
+                this.end = -1;
+                // Empty states and the SNS tab replace the container content; re-attach our skeleton
+                if (this.body.parentNode !== feedContainer) {{
+                    feedContainer.replaceChildren(this.topSpacer, this.body, this.bottomSpacer);
+                }}
+                this.computeOffsets();
+                this.update();
+            }},
+
+            computeOffsets() {{
+                const offsets = new Array(this.items.length + 1);
+                offsets[0] = 0;
+                for (let i = 0; i < this.items.length; i++) {{
+                    offsets[i + 1] = offsets[i] + (cardHeights.get(this.items[i].id) || CARD_ESTIMATE_PX);
+                }}
+                this.offsets = offsets;
+            }},
+
+            indexAt(y) {{
+                // Binary search for the item that contains offset y
+                let lo = 0, hi = this.items.length - 1;
+                while (lo < hi) {{
+                    const mid = (lo + hi) >> 1;
+                    if (this.offsets[mid + 1] <= y) lo = mid + 1; else hi = mid;
+                }}
+                return lo;
+            }},
+
+            update() {{
+                if (this.items.length === 0 || this.body.parentNode !== feedContainer) return;
+                const viewTop = scrollArea.getBoundingClientRect().top - this.topSpacer.getBoundingClientRect().top;
+                const start = this.indexAt(Math.max(0, viewTop - OVERSCAN_PX));
+                const end = Math.min(this.items.length, this.indexAt(viewTop + scrollArea.clientHeight + OVERSCAN_PX) + 1);
+                if (start === this.start && end === this.end) return;
+                this.start = start;
+                this.end = end;
+
+                const nodes = [];
+                for (let i = start; i < end; i++) nodes.push(getCardNode(this.items[i]));
+                this.body.replaceChildren(...nodes);
+
+                // Replace estimates with real heights for everything we just materialized
+                let changed = false;
+                for (let i = start; i < end; i++) {{
+                    const id = this.items[i].id;
+                    const height = cardNodes.get(id).offsetHeight;
+                    if (height && height !== cardHeights.get(id)) {{
+                        cardHeights.set(id, height);
+                        changed = true;
+                    }}
+                }}
+                if (changed) this.computeOffsets();
+                this.topSpacer.style.height = `${{this.offsets[start]}}px`;
+                this.bottomSpacer.style.height = `${{this.offsets[this.items.length] - this.offsets[end]}}px`;
+            }},
+
+            invalidate() {{
+                // Card heights depend on the viewport width
+                cardHeights.clear();
+                this.start = -1;
+                this.end = -1;
+                this.computeOffsets();
+                this.update();
+            }}
+        }};
+
+        let scrollFrame = null;
+        scrollArea.addEventListener('scroll', () => {{
+            if (scrollFrame) return;
+            scrollFrame = requestAnimationFrame(() => {{
+                scrollFrame = null;
+                if (currentTab !== 'sns') virtualFeed.update();
+            }});
+        }}, {{passive: true}});
+        window.addEventListener('resize', () => virtualFeed.invalidate());
+
+        // --- Index-backed Filtering --- //
+        // The curation stage ships a normalized search_text per article plus an inverted index
+        // (bigram / tag / category -> article positions), so filtering touches only the matches.
+        let positionById = new Map();
+
+        function normalizeText(text) {{
+            return (text || '').normalize('NFKC').toLowerCase();
+        }}
+
+        function prepareArticles() {{
+            positionById = new Map(articles.map((a, i) => [a.id, i]));
+            if (searchIndex) return;
+            // Older snapshots without an index: build the same structure once on the client
+            searchIndex = {{ grams: {{}}, tags: {{}}, categories: {{}} }};
+            articles.forEach((a, pos) => {{
+                if (!a.search_text) {{
+                    a.search_text = normalizeText(`${{a.title_ja}} ${{a.source}} ${{a.core_sentence}} ${{(a.tags || []).join(' ')}}`);
+                }}
+                const chars = Array.from(a.search_text);
+                const seen = new Set();
+                for (let i = 0; i < chars.length - 1; i++) {{
+                    const gram = chars[i] + chars[i + 1];
+                    if (seen.has(gram)) continue;
+                    seen.add(gram);
+                    (searchIndex.grams[gram] = searchIndex.grams[gram] || []).push(pos);
+                }}
+                new Set(a.tags || []).forEach(t => (searchIndex.tags[t] = searchIndex.tags[t] || []).push(pos));
+                (searchIndex.categories[a.category] = searchIndex.categories[a.category] || []).push(pos);
+            }});
+        }}
+
+        function intersectSorted(a, b) {{
+            const out = [];
+            let i = 0, j = 0;
+            while (i < a.length && j < b.length) {{
+                if (a[i] === b[j]) {{ out.push(a[i]); i++; j++; }}
+                else if (a[i] < b[j]) i++;
+                else j++;
+            }}
+            return out;
+        }}
+
+        function searchPositions(query) {{
+            // Candidates for a substring query: intersection of the postings of its bigrams
+            const chars = Array.from(query);
+            if (chars.length < 2) return null;
+            let result = null;
+            for (let i = 0; i < chars.length - 1; i++) {{
+                const postings = searchIndex.grams[chars[i] + chars[i + 1]];
+                if (!postings) return [];
+                result = result ? intersectSorted(result, postings) : postings;
+                if (result.length === 0) break;
+            }}
+            return result;
+        }}
+
+        function filterArticles() {{
+            let positions = null; // null = every article
+            if (currentTab === 'saved') {{
+                positions = [...savedIds].map(id => positionById.get(id)).filter(p => p !== undefined).sort((a, b) => a - b);
+            }}
+            else if (currentTab !== 'all') {{
+                positions = searchIndex.categories[currentTab] || [];
+            }}
+            if (searchQuery) {{
+                const hits = searchPositions(searchQuery);
+                if (hits) positions = positions ? intersectSorted(positions, hits) : hits;
+            }}
+            if (positions === null) positions = articles.map((_, i) => i);
+
+            const muted = new Set();
+            mutedTags.forEach(t => (searchIndex.tags[t] || []).forEach(p => muted.add(p)));
+
+            const result = [];
+            for (const pos of positions) {{
+                if (muted.has(pos)) continue;
+                const a = articles[pos];
+                // Bigram hits are candidates only; confirm the actual substring match
+                if (searchQuery && !a.search_text.includes(searchQuery)) continue;
+                result.push(a);
+            }}
+            return result;
+        }}
+
         // The Engine Renderer
         function renderFeed() {{
             if (currentTab === 'sns') {{
@@ -708,21 +1002,8 @@ html_template = f"""
                 return;
             }}
 
-            // Apply all filters completely clientside for instant UX
-            let filtered = articles.filter(a => {{
-                // Check if any tag is muted
-                if (a.tags && a.tags.some(t => mutedTags.includes(t))) return false;
-
-                // Search check (using the simplified data structure)
-                const matchString = `${{a.title_ja}} ${{a.source}} ${{a.core_sentence}} ${{a.tags.join(' ')}}`.toLowerCase();
-                if (searchQuery && !matchString.includes(searchQuery)) return false;
-
-                // Tab Context check
-                if (currentTab === 'saved') return savedIds.includes(a.id);
-                if (currentTab !== 'all') return a.category === currentTab;
-
-                return true; // 'all'
-            }});
+            // Apply all filters completely clientside for instant UX (index + Set lookups)
+            let filtered = filterArticles();
 
             currentVisibleArticles = filtered;
 
@@ -742,84 +1023,54 @@ html_template = f"""
                 ? `保存済みの記事: <span class="text-white">${{filtered.length}}件</span>`
                 : `<span class="text-white">${{filtered.length}}件</span> の厳選トップニュース`;
 
-            // Build the DOM string efficiently
-            const html = filtered.map(a => {{
-                const isSaved = savedIds.includes(a.id);
-                const isRead = readIds.includes(a.id);
-                const accentColor = getAccentColor(a.category);
-
-                const opacityClass = isRead ? 'opacity-50 grayscale-[30%] transition-all' : '';
-                const blueDot = isRead ? '' : `<span id="dot-${{a.id}}" class="inline-block w-2.5 h-2.5 bg-blue-500 rounded-full shadow-[0_0_8px_rgba(59,130,246,0.8)] ml-2 mb-0.5 animate-pulse"></span>`;
-
-                // Beautiful Pill Tags
-                const tagsHtml = (a.tags || []).map(t =>
-                    `<span class="inline-flex items-center px-2 py-0.5 rounded text-[0.65rem] font-medium bg-[#58a6ff]/10 text-blue-400 border border-blue-500/20 mr-1.5 mb-2">${{t}}</span>`
-                ).join('');
-
-                // Core 1-Sentence Summary format
-                const summaryHtml = `<p class="text-[0.95rem] font-medium text-gray-300 leading-relaxed mt-3 mb-1 pl-3 border-l-2 border-[#58a6ff]/70">${{a.core_sentence || ''}}</p>`;
-
-                // Beautiful Insight Display
-                const insightHtml = a.insight
-                    ? `<p class="text-[0.85rem] font-semibold text-amber-200/90 mt-3 pt-2 border-t border-gray-700/50">${{a.insight}}</p>`
-                    : '';
-
-                return `
-                    <div id="card-${{a.id}}" class="relative bg-[#161b22] border border-gray-700/60 rounded-2xl overflow-hidden card-anim shadow-sm ${{opacityClass}}">
-                        <div class="absolute top-0 left-0 right-0 h-1" style="background-color: ${{accentColor}}"></div>
-
-                        <div class="p-4 pb-0">
-                            <!-- Source and Bookmark -->
-                            <div class="flex justify-between items-center mb-2.5">
-                                <div class="flex items-center gap-2">
-                                    <span class="text-[0.65rem] font-bold text-gray-400 bg-white/5 border border-white/5 py-0.5 px-2 rounded uppercase tracking-wider">${{a.source}}</span>
-                                </div>
-                                <button data-id="${{a.id}}" onclick="toggleBookmark('${{a.id}}', event)" class="p-2 -mr-2 -mt-2 rounded-full hover:bg-white/10 transition z-10 active:scale-90">
-                                    ${{isSaved
-                                        ? `<svg class="w-[1.15rem] h-[1.15rem] text-yellow-500 drop-shadow-sm" fill="currentColor" viewBox="0 0 20 20"><path d="M5 4a2 2 0 012-2h6a2 2 0 012 2v14l-5-2.5L5 18V4z"></path></svg>`
-                                        : `<svg class="w-[1.15rem] h-[1.15rem] text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 5a2 2 0 012-2h10a2 2 0 012 2v16l-7-3.5L5 21V5z"></path></svg>`
-                                    }}
-                                </button>
-                            </div>
-                            
-                            <a href="${{a.url}}" target="_blank" onclick="markAsRead('${{a.id}}')" class="block outline-none tap-highlight-transparent group hover:opacity-90 transition mt-3">
-                                <!-- Title and Tags -->
-                                <h2 class="text-[1.15rem] font-bold text-[#e6edf3] mb-2.5 leading-snug tracking-tight group-hover:text-blue-400 transition-colors">${{a.title_ja}}${{blueDot}}</h2>
-                                <div class="flex flex-wrap mb-2">
-                                    ${{tagsHtml}}
-                                </div>
-                                
-                                <!-- Core 1-sentence summary & Insight -->
-                                ${{summaryHtml}}
-                                ${{insightHtml}}
-                            </a>
-                        </div>
-                        
-                        <!-- Actions -->
-                        <div class="px-4 py-3 bg-[#11151c] flex justify-between items-center border-t border-gray-800/80 mt-4">
-                            <span class="text-[0.7rem] text-gray-500 font-medium flex items-center gap-1.5 min-w-0 flex-shrink-0">
-                                <svg class="w-3.5 h-3.5 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4l3 3m6-3a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>
-                                <span class="truncate">約${{a.read_time_min || 1}}分</span>
-                            </span>
-                            <div class="flex items-center gap-2.5">
-                                <button onclick="muteArticle('${{a.id}}', event)" class="p-1.5 rounded-full text-gray-500/60 hover:text-red-400 hover:bg-white/5 transition active:scale-90" title="興味なし（関連タグをミュート）">
-                                    <svg class="w-[1.1rem] h-[1.1rem]" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg>
-                                </button>
-                                <a href="${{a.url}}" target="_blank" onclick="markAsRead('${{a.id}}')" class="text-blue-400 text-[0.75rem] font-bold tracking-wide flex items-center gap-1.5 bg-[#58a6ff]/10 border border-[#58a6ff]/20 px-3.5 py-1.5 rounded-full hover:bg-[#58a6ff]/20 active:scale-95 transition flex-shrink-0">
-                                    <span class="whitespace-nowrap">記事を読む</span>
-                                    <svg class="w-3 h-3 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2.5" d="M14 5l7 7m0 0l-7 7m7-7H3"></path></svg>
-                                </a>
-                            </div>
-                        </div>
-                    </div>
-                `;
-            }}).join('');
-            
-            feedContainer.innerHTML = html;
+            virtualFeed.setItems(filtered);
         }}
         
+        // Static payload loader: the URL is content-hashed and revalidated with ETag (304 on repeat visits).
+        // The .gz sibling is decompressed locally when the browser supports DecompressionStream.
+        async function loadPayload(url) {{
+            if ('DecompressionStream' in window) {{
+                try {{
+                    const res = await fetch(url + '.gz', {{ cache: 'no-cache' }});
+                    if (res.ok) {{
+                        const stream = res.body.pipeThrough(new DecompressionStream('gzip'));
+                        return await new Response(stream).json();
+                    }}
+                }} catch (err) {{
+                    console.warn('Compressed payload failed, falling back to plain JSON:', err);
+                }}
+            }}
+            const res = await fetch(url, {{ cache: 'no-cache' }});
+            if (!res.ok) throw new Error(`Payload request failed: ${{res.status}}`);
+            return await res.json();
+        }}
+        
+        // A payload could not be fetched (proxy, pruned file...): reload the app with the
+        // data inlined. Browsers that block navigation from the sandboxed frame get a link.
+        function inlineFallback() {{
+            let inlineUrl = '?inline=1';
+            try {{
+                const url = new URL(window.parent.location.href);
+                url.searchParams.set('inline', '1');
+                inlineUrl = url.toString();
+                window.parent.location.replace(inlineUrl);
+            }} catch (err) {{
+                console.warn('Inline reload blocked:', err);
+            }}
+            showToast(`データの読み込みに失敗しました。<a href="${{inlineUrl}}" target="_top" class="text-blue-400 underline ml-1">再読み込み</a>`, true);
+        }}
+
         // Initial Mount
-        renderFeed();
+        Promise.all([
+            articlesUrl ? loadPayload(articlesUrl).then(data => {{ articles = data.articles; searchIndex = data.index; resetCardCache(); }}) : null,
+            bskyUrl ? loadPayload(bskyUrl).then(data => {{ bskyPosts = data; }}) : null
+        ]).catch(err => {{
+            console.error('Payload load error:', err);
+            inlineFallback();
+        }}).finally(() => {{
+            prepareArticles();
+            renderFeed();
+        }});
         
         // --- Toast Notification System --- //
         function showToast(htmlContent, persistent = false) {{
@@ -853,7 +1104,7 @@ html_template = f"""
                     <circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle>
                     <path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path>
                 </svg>
-                <span class="text-[#c9d1d9] tracking-tight">最新ニュースをキュレーション中... <span class="text-gray-500 text-xs ml-1 whitespace-nowrap">(操作可能です)</span></span>
+                <span class="text-[#c9d1d9] tracking-tight">最新ニュースをキュレーション中{f' ({refresh_progress})' if refresh_progress else ''}... <span class="text-gray-500 text-xs ml-1 whitespace-nowrap">(操作可能です)</span></span>
             `, true);
         }}
     </script>
@@ -861,6 +1112,13 @@ html_template = f"""
 </html>
 """
 
+html_template = render_document(
+    shared_snapshot.version, bluesky_key, is_updating_flag, just_updated_flag,
+    refresh_job.progress_label() if is_updating_flag else "",
+    shared_snapshot.payload_url, bluesky_url,
+    shared_snapshot.articles_json, shared_snapshot.index_json, bluesky_posts_json
+)
+
 # Render the massive custom component block
 # Streamlit acts merely as a data pipeline, bypassing standard UI completely
 components.html(html_template, height=800)
@@ -870,8 +1128,15 @@ if is_updating_flag:
     # Hang the python script execution while the background thread does its job.
     # Because Streamlit streams HTML down to the browser before reaching here,
     # the frontend renders perfectly and remains fully interactive!
-    while os.path.exists(flag_path):
+    # The curation engine publishes each category as soon as it is done, so we also
+    # rerun whenever the snapshot changes to stream partial results to the browser.
+    # The wait is bounded (the run itself is budgeted by pipeline.RUN_BUDGET): after
+    # POLL_SECONDS the session reruns anyway and refreshes its progress label.
+    poll_until = time.time() + POLL_SECONDS
+    while refresh_job.is_running() and time.time() < poll_until:
         time.sleep(1)
+        if snapshot_store.current_version() != snapshot_version:
+            break
     
-    # Once the file is deleted (thread finished), auto-rerun to naturally push new data.
+    # Once the job is finished (or found dead) or a category landed, auto-rerun to naturally push new data.
     st.rerun()
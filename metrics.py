@@ -0,0 +1,260 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Run-level instrumentation for the curation engine.
+# - stage latency histograms: every pipeline.run_blocking / run_translation / run_cpu
+#   call (by function name) plus finer stages recorded where they happen
+#   (feed.download, feed.parse, translation.call)
+# - per-host request latency, status errors and bytes downloaded (http_client)
+# - counters: feed cache 304s / fallbacks, translation cache hits / misses / calls /
+#   failures, article-store reuse
+# Every run records into its own Collector: start_run() binds it to the calling context
+# and pipeline carries that context into its executor threads, so requests made
+# outside a run (the Bluesky refresher) or by a concurrent run never mix in.
+# run_curation stores the report as the "metrics" sidecar of the snapshot it publishes
+# (data/snapshots/v<version>.metrics.side.json); get_latest_ai_news writes LATEST_PATH.
+# AINEWS_PROFILE=1 also runs a sampling profiler over every thread of the run and adds
+# its collapsed stacks as the "profile" sidecar (CPU-pool workers are separate
+# processes: profile them in-process with AINEWS_CPU_WORKERS=1).
+#   python metrics.py [path]   summarizes a metrics file (default: current snapshot)
+PROFILE = os.environ.get("AINEWS_PROFILE", "0") == "1"
+PROFILE_INTERVAL = 0.01
+LATEST_PATH = os.path.join("data", "latest_metrics.json")
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# Raw samples kept per histogram for the percentiles
+MAX_SAMPLES = 5000
+
+# Leaf frames of threads that are only waiting for work
+_IDLE_LEAVES = {("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get"), ("thread.py", "_worker")}
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.samples = []
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, ms)
+        self.buckets[next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))] += 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(ms)
+
+    def percentile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    def as_dict(self):
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "p50_ms": round(self.percentile(0.5), 2),
+            "p95_ms": round(self.percentile(0.95), 2),
+            "max_ms": round(self.max, 2),
+            "buckets_ms": {label: n for label, n in zip(labels, self.buckets) if n}
+        }
+
+class HostStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.bytes = 0
+        self.errors = 0
+
+    def as_dict(self):
+        return dict(self.latency.as_dict(), bytes=self.bytes, errors=self.errors)
+
+class Sampler(threading.Thread):
+    """
+    Sampling profiler: every interval, counts the Python stack of every other thread.
+    """
+    def __init__(self, interval=PROFILE_INTERVAL):
+        super().__init__(name="metrics-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._halt = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._halt.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((os.path.basename(code.co_filename), code.co_name, code.co_firstlineno))
+                    frame = frame.f_back
+                if stack and stack[0][:2] in _IDLE_LEAVES:
+                    continue
+                self.stacks[";".join(f"{name} ({filename}:{line})" for filename, name, line in reversed(stack))] += 1
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+        return dict(self.stacks.most_common())
+
+class Collector:
+    """
+    The metrics of one run.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.hosts = {}
+        self.counters = Counter()
+        self.started = time.time()
+        self.sampler = None
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.stages.get(name)
+            if histogram is None:
+                histogram = self.stages[name] = Histogram()
+            histogram.add(seconds)
+
+    def _host(self, host):
+        stats = self.hosts.get(host)
+        if stats is None:
+            stats = self.hosts[host] = HostStats()
+        return stats
+
+    def observe_host(self, host, seconds, nbytes=0, error=False):
+        with self._lock:
+            stats = self._host(host)
+            stats.latency.add(seconds)
+            stats.errors += 1 if error else 0
+            stats.bytes += nbytes
+            self.counters["http.bytes"] += nbytes
+
+    def add_bytes(self, host, nbytes):
+        with self._lock:
+            self._host(host).bytes += nbytes
+            self.counters["http.bytes"] += nbytes
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def report(self):
+        with self._lock:
+            return {
+                "started_at": self.started,
+                "duration_s": round(time.time() - self.started, 3),
+                "stages": {name: h.as_dict() for name, h in sorted(self.stages.items())},
+                "hosts": {host: s.as_dict() for host, s in sorted(self.hosts.items())},
+                "counters": dict(sorted(self.counters.items()))
+            }
+
+# The collector of the run the calling code belongs to (None: not recorded)
+_current = contextvars.ContextVar("metrics_run", default=None)
+
+def observe(name, seconds):
+    run = _current.get()
+    if run is not None:
+        run.observe(name, seconds)
+
+def observe_host(host, seconds, nbytes=0, error=False):
+    run = _current.get()
+    if run is not None:
+        run.observe_host(host, seconds, nbytes, error)
+
+def add_bytes(host, nbytes):
+    run = _current.get()
+    if run is not None:
+        run.add_bytes(host, nbytes)
+
+def count(name, n=1):
+    run = _current.get()
+    if run is not None:
+        run.count(name, n)
+
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+def start_run():
+    """
+    Starts a new collector for the calling context (and the tasks / pipeline calls
+    it starts) and the profiler when enabled.
+    """
+    run = Collector()
+    _current.set(run)
+    if PROFILE:
+        run.sampler = Sampler()
+        run.sampler.start()
+    return run
+
+def report():
+    run = _current.get()
+    return (run or Collector()).report()
+
+def finish_run():
+    """
+    Returns {"metrics": report} plus {"profile": collapsed stacks} when profiling,
+    ready to be passed as snapshot sidecars.
+    """
+    run = _current.get() or Collector()
+    sidecars = {"metrics": run.report()}
+    if run.sampler is not None:
+        sidecars["profile"] = run.sampler.stop()
+        run.sampler = None
+    return sidecars
+
+def write(path, sidecars):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(sidecars, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def summarize(data, top=15):
+    metrics = data.get("metrics", data)
+    print(f"run: {metrics.get('duration_s', 0):.1f} s")
+    print(f"  {'stage':<28}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for name, h in sorted(metrics.get("stages", {}).items(), key=lambda item: -item[1]["total_s"])[:top]:
+        print(f"  {name:<28}{h['count']:>6}{h['p50_ms']:>10.1f}{h['p95_ms']:>10.1f}{h['total_s']:>10.2f}")
+    print(f"  {'host':<28}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'KB':>10}{'errors':>8}")
+    for host, s in sorted(metrics.get("hosts", {}).items(), key=lambda item: -item[1]["total_s"])[:top]:
+        print(f"  {host:<28}{s['count']:>6}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['bytes'] / 1024:>10.0f}{s['errors']:>8}")
+    for name, value in metrics.get("counters", {}).items():
+        print(f"  {name:<28}{value:>10}")
+
+    profile = data.get("profile")
+    if profile:
+        # Self samples per function (the leaf of each stack)
+        leaves = Counter()
+        for stack, samples in profile.items():
+            leaves[stack.rsplit(";", 1)[-1]] += samples
+        total = sum(leaves.values()) or 1
+        print("  profile (self samples):")
+        for frame, samples in leaves.most_common(top):
+            print(f"  {samples / total * 100:6.1f}%  {frame}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            summarize(json.load(f))
+    else:
+        import snapshot_store
+        version = snapshot_store.current_version()
+        sidecars = {name: snapshot_store.load_sidecar(version, name) for name in ("metrics", "profile")}
+        summarize({name: data for name, data in sidecars.items() if data is not None})
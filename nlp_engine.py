@@ -0,0 +1,79 @@
+import os
+import re
+import string
+import threading
+from lazy_deps import lazy, ensure_nltk_data
+
+nltk = lazy("nltk", on_load=ensure_nltk_data)
+nltk_corpus = lazy("nltk.corpus", on_load=ensure_nltk_data)
+sumy_tokenizers = lazy("sumy.nlp.tokenizers", on_load=ensure_nltk_data)
+
+# Warm NLP state shared by extractor.py and generate_curation.py.
+# Tokenizers and stopword sets are built once per process and reused for every
+# article (text cleaning lives in text_processing). get_engine() is fork-aware, so
+# pool workers build their own engine instead of inheriting a half-initialized one.
+
+TAG_STOP_EXTRA = ['The', 'A', 'An', 'It', 'This', 'That']
+
+# Same rule as sumy's Tokenizer._WORD_PATTERN: which tokens count as words
+WORD_RE = re.compile(r"^[^\W\d_](?:[^\W\d_]|['-])*$", re.UNICODE)
+
+class NLPEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokenizers = {}
+        self._tag_stop_words = None
+
+    def tokenizer(self, lang):
+        tokenizer = self._tokenizers.get(lang)
+        if tokenizer is None:
+            with self._lock:
+                tokenizer = self._tokenizers.get(lang)
+                if tokenizer is None:
+                    tokenizer = sumy_tokenizers.Tokenizer(lang)
+                    self._tokenizers[lang] = tokenizer
+        return tokenizer
+
+    def tag_stop_words(self):
+        if self._tag_stop_words is None:
+            with self._lock:
+                if self._tag_stop_words is None:
+                    self._tag_stop_words = frozenset(nltk_corpus.stopwords.words('english') + list(string.punctuation) + TAG_STOP_EXTRA)
+        return self._tag_stop_words
+
+    def word_tokenize(self, text):
+        return nltk.word_tokenize(text)
+
+    def sentence_words(self, sentence, lang):
+        """
+        Words of an already split sentence, as sumy's Tokenizer.to_words returns them.
+        For English this skips the second punkt pass inside nltk.word_tokenize.
+        """
+        if lang == "english":
+            return [w for w in nltk.word_tokenize(sentence, preserve_line=True) if WORD_RE.match(w)]
+        return self.tokenizer(lang).to_words(sentence)
+
+    def sent_tokenize(self, text):
+        return nltk.sent_tokenize(text)
+
+    def warm(self, langs=("english", "japanese")):
+        """
+        Builds everything up front (worker initializers call this).
+        """
+        for lang in langs:
+            self.tokenizer(lang)
+        self.tag_stop_words()
+        return self
+
+_engine = None
+_engine_pid = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    global _engine, _engine_pid
+    if _engine is None or _engine_pid != os.getpid():
+        with _engine_lock:
+            if _engine is None or _engine_pid != os.getpid():
+                _engine = NLPEngine()
+                _engine_pid = os.getpid()
+    return _engine
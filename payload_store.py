@@ -0,0 +1,49 @@
+import gzip
+import hashlib
+import os
+import threading
+
+# Content-hashed, precompressed static payloads for the embedded frontend.
+# Files land in Streamlit's static folder (served at app/static/ when
+# server.enableStaticServing is on, with ETag / 304 revalidation), next to a
+# .gz sibling that the browser decompresses itself (DecompressionStream).
+STATIC_DIR = os.path.join("static", "curation")
+URL_PREFIX = "app/static/curation"
+KEEP_PAYLOADS = 6
+
+def _atomic_write_bytes(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _prune(kind, keep_path):
+    prefix = kind + "."
+    plain = [os.path.join(STATIC_DIR, n) for n in os.listdir(STATIC_DIR) if n.startswith(prefix) and n.endswith(".json")]
+    plain.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+    for path in plain[KEEP_PAYLOADS:]:
+        if path == keep_path:
+            continue
+        for suffix in ("", ".gz"):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+def publish_payload(kind, payload_json):
+    """
+    Publishes payload_json as <kind>.<hash>.json (+ compressed siblings) and returns
+    its URL relative to the app root. Idempotent: the same content keeps the same URL.
+    """
+    data = payload_json.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    path = os.path.join(STATIC_DIR, f"{kind}.{digest}.json")
+
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        _atomic_write_bytes(path + ".gz", gzip.compress(data, 9))
+        # The plain file goes last: once it exists, the whole payload is complete
+        _atomic_write_bytes(path, data)
+        _prune(kind, path)
+
+    return f"{URL_PREFIX}/{os.path.basename(path)}"
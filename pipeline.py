@@ -0,0 +1,166 @@
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import metrics
+
+# Hybrid executor for the curation engine, driven from one asyncio task graph.
+# - run_blocking: network I/O (feed fetches, downloads) on one shared thread pool;
+#   this is the only global I/O concurrency limit
+# - run_translation: translation requests on their own small thread pool, so a hung
+#   translation service can never take the threads feeds and downloads need
+# - run_cpu: CPU-bound stages (HTML extraction, tokenizing, LSA) on a process pool
+#   so they are not serialized on the GIL. Workers warm their NLP engine once and
+#   only receive / return compact text payloads. With a single core (or
+#   AINEWS_CPU_WORKERS=1, or a broken pool) run_cpu falls back to the thread pool.
+# Every call is timed as a metrics stage named after fn (queueing included), and runs
+# in the caller's context, so it records into the caller's metrics collector.
+#
+# Deadlines: a run gets RUN_BUDGET seconds (AINEWS_RUN_BUDGET) and every stage is
+# awaited through within(), with the smaller of its STAGE_TIMEOUTS entry and what is
+# left of the budget. A stage that misses it returns the caller's fallback instead
+# (RSS summary instead of the page, original strings instead of translations...),
+# so a run ends shortly after its budget whatever the network does. Threads can't be
+# cancelled: an abandoned call finishes in the background, bounded by the HTTP
+# client's own timeouts. hedged() starts a second identical request when the first
+# one is slower than HEDGE_AFTER seconds (AINEWS_HEDGE_AFTER, 0 disables).
+MAX_CONCURRENCY = 16
+TRANSLATE_CONCURRENCY = 4
+CPU_WORKERS = int(os.environ.get("AINEWS_CPU_WORKERS", os.cpu_count() or 1))
+
+RUN_BUDGET = float(os.environ.get("AINEWS_RUN_BUDGET", "180"))
+STAGE_TIMEOUTS = {
+    "feed": 30,
+    "dedup": 15,
+    "download": 25,
+    "analyze": 30,
+    "summarize": 60,
+    "translate": 45,
+    "fallback": 10,
+}
+HEDGE_AFTER = float(os.environ.get("AINEWS_HEDGE_AFTER", "3"))
+
+# Monotonic end of the current run's budget; tasks inherit it from the run's coroutine
+_run_deadline = contextvars.ContextVar("run_deadline", default=None)
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="curation")
+_translate_executor = ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY, thread_name_prefix="translate")
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+async def run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    with metrics.stage(_stage_name(fn)):
+        return await loop.run_in_executor(_executor, functools.partial(contextvars.copy_context().run, fn, *args, **kwargs))
+
+async def run_translation(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    with metrics.stage(_stage_name(fn)):
+        return await loop.run_in_executor(_translate_executor, functools.partial(contextvars.copy_context().run, fn, *args, **kwargs))
+
+def _stage_name(fn):
+    return getattr(fn, "__name__", "call")
+
+def _init_worker():
+    try:
+        from nlp_engine import get_engine
+        get_engine().warm()
+    except Exception as e:
+        # The stage itself will report the problem; a failed warm-up must not kill the worker
+        print(f"CPU worker warm-up failed: {e}")
+
+def _cpu_pool():
+    global _process_pool
+    if CPU_WORKERS <= 1:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: the pool is usually created from a background thread (Streamlit refresh),
+            # where fork is unsafe; the curation modules import cheaply (lazy_deps)
+            _process_pool = ProcessPoolExecutor(
+                max_workers=CPU_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return _process_pool
+
+def _discard_pool(pool):
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def start_budget(seconds=RUN_BUDGET):
+    """
+    Starts the run budget for the calling coroutine and the tasks it creates.
+    """
+    _run_deadline.set(time.monotonic() + seconds)
+
+def remaining():
+    deadline = _run_deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+async def within(stage, awaitable, default=None, budget=True):
+    """
+    Awaits awaitable under the stage's deadline; returns default if it is missed.
+    budget=False ignores the run budget (cheap fallbacks that must still run).
+    """
+    timeouts = [STAGE_TIMEOUTS.get(stage), remaining() if budget else None]
+    timeouts = [t for t in timeouts if t is not None]
+    try:
+        return await asyncio.wait_for(awaitable, min(timeouts) if timeouts else None)
+    except asyncio.TimeoutError:
+        metrics.count(f"deadline.{stage}")
+        return default
+
+async def hedged(fn, *args, delay=HEDGE_AFTER):
+    """
+    run_blocking(fn, *args), plus a second identical call if the first hasn't returned
+    after delay seconds; the first truthy result wins (slow hosts, lost packets).
+    """
+    tasks = [asyncio.ensure_future(run_blocking(fn, *args))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay or None)
+        if not done:
+            metrics.count("hedge.started")
+            tasks.append(asyncio.ensure_future(run_blocking(fn, *args)))
+        pending = set(tasks)
+        result = error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    error = task.exception()
+                elif task.result():
+                    if task is not tasks[0]:
+                        metrics.count("hedge.won")
+                    return task.result()
+                else:
+                    result = task.result()
+        if error and result is None:
+            raise error
+        return result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def run_cpu(fn, *args):
+    """
+    Runs a module-level function on the CPU pool. fn and args must be picklable.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _cpu_pool()
+    with metrics.stage(_stage_name(fn)):
+        if pool is not None:
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool as e:
+                print(f"CPU pool broken, falling back to threads: {e}")
+                _discard_pool(pool)
+        return await loop.run_in_executor(_executor, functools.partial(contextvars.copy_context().run, fn, *args))
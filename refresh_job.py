@@ -0,0 +1,165 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+# Cross-process refresh job manager (replaces data/is_updating.flag).
+# - data/refresh.lock is created with O_CREAT | O_EXCL, so exactly one process
+#   (or Streamlit worker) can own a curation run at a time
+# - data/refresh_status.json records start time, heartbeat, per-category
+#   progress and the last error, for the UI and for stale-job detection
+# - a job whose heartbeat stops for STALE_AFTER seconds is considered dead
+LOCK_PATH = os.path.join("data", "refresh.lock")
+STATUS_PATH = os.path.join("data", "refresh_status.json")
+HEARTBEAT_INTERVAL = 5
+STALE_AFTER = 60
+
+def _write_status(status):
+    os.makedirs(os.path.dirname(STATUS_PATH), exist_ok=True)
+    tmp_path = f"{STATUS_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(status, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, STATUS_PATH)
+
+def read_status():
+    try:
+        with open(STATUS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _read_lock(path=LOCK_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _lock_identity(path=LOCK_PATH):
+    # (contents, mtime): a lock re-created in between never has the same pair
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _read_lock(path), mtime
+
+def _is_stale(lock):
+    status = read_status()
+    if lock and status.get("job_id") == lock.get("job_id"):
+        last_beat = status.get("heartbeat", 0)
+    else:
+        # Lock without a matching status record (crashed right after acquiring)
+        try:
+            last_beat = os.path.getmtime(LOCK_PATH)
+        except OSError:
+            return False
+    return time.time() - last_beat > STALE_AFTER
+
+def is_running():
+    if not os.path.exists(LOCK_PATH):
+        return False
+    return not _is_stale(_read_lock())
+
+def _break_stale_lock(identity):
+    # Renaming is atomic: if two processes race to break the same lock, one rename fails
+    stale_path = f"{LOCK_PATH}.stale.{uuid.uuid4().hex}"
+    try:
+        os.rename(LOCK_PATH, stale_path)
+    except OSError:
+        return False
+    if _lock_identity(stale_path) == identity:
+        os.remove(stale_path)
+        return True
+    # Between our staleness check and the rename, another process broke the stale lock
+    # and took a fresh one: that is what we just moved, so put it back (link never
+    # overwrites a lock created meanwhile)
+    try:
+        os.link(stale_path, LOCK_PATH)
+    except OSError:
+        pass
+    os.remove(stale_path)
+    return False
+
+class RefreshJob:
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.status = {
+            "job_id": job_id,
+            "state": "running",
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "started_at": time.time(),
+            "heartbeat": time.time(),
+            "categories": {},
+            "last_error": None,
+            "finished_at": None
+        }
+        self._heartbeat_thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            with self._lock:
+                self.status["heartbeat"] = time.time()
+                _write_status(self.status)
+
+    def update(self, category, state, detail=None):
+        with self._lock:
+            self.status["categories"][category] = {"state": state, "detail": detail, "at": time.time()}
+            if state == "failed":
+                self.status["last_error"] = f"{category}: {detail}"
+            self.status["heartbeat"] = time.time()
+            _write_status(self.status)
+
+    def finish(self, error=None):
+        self._stop.set()
+        with self._lock:
+            self.status["state"] = "failed" if error else "done"
+            if error:
+                self.status["last_error"] = str(error)
+            self.status["finished_at"] = time.time()
+            self.status["heartbeat"] = time.time()
+            _write_status(self.status)
+        # Only remove the lock if it is still ours (it may have been broken as stale)
+        lock = _read_lock()
+        if lock and lock.get("job_id") == self.job_id:
+            try:
+                os.remove(LOCK_PATH)
+            except OSError:
+                pass
+
+def try_start():
+    """
+    Atomically acquires the refresh lock. Returns a RefreshJob, or None if
+    another live job already owns it.
+    """
+    os.makedirs(os.path.dirname(LOCK_PATH), exist_ok=True)
+    for _ in range(2):
+        job_id = uuid.uuid4().hex
+        try:
+            fd = os.open(LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            identity = _lock_identity()
+            if identity and _is_stale(identity[0]) and _break_stale_lock(identity):
+                continue
+            return None
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"job_id": job_id, "pid": os.getpid(), "host": socket.gethostname()}, f)
+        job = RefreshJob(job_id)
+        _write_status(job.status)
+        job._heartbeat_thread.start()
+        return job
+    return None
+
+def progress_label():
+    """
+    Short "done/total" progress text for the UI, or '' when nothing is known.
+    """
+    categories = read_status().get("categories", {})
+    if not categories:
+        return ""
+    done = len([c for c in categories.values() if c.get("state") in ("done", "failed")])
+    return f"{done}/{len(categories)}"
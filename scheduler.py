@@ -0,0 +1,266 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Standalone curation scheduler: `python generate_curation.py schedule`
+# (or `python -m scheduler`) keeps running and refreshes each feed on its own cadence.
+# - every configured feed URL has a poll interval: an EWMA of the feed's observed
+#   publish interval, clamped to [MIN_INTERVAL, MAX_INTERVAL], so busy feeds are
+#   polled often and WIRED rarely. hnrss keyword queries share one broad fetch (see
+#   feed_plan); each query's cadence and new links only count the entries its route
+#   accepts, and the shared fetch is polled when any of its queries is due
+# - only the categories whose feeds actually carried new entries are re-curated;
+#   their other feeds are served from the feed cache without a request, and the
+#   snapshot is republished with just those categories replaced
+# - state (intervals, next due time, seen links) lives in STATE_PATH; the daemon's
+#   heartbeat in HEARTBEAT_PATH tells main.py that page views must not scrape
+# - links only count as seen once their categories were republished, so a failed
+#   category is retried on the next poll instead of waiting for another new link
+# - the refresh button of main.py asks for an immediate full pass (REQUEST_PATH):
+#   every feed polled, every category re-curated
+# Runs hold the refresh_job lock like any other curation run.
+STATE_PATH = os.path.join("data", "schedule_state.json")
+HEARTBEAT_PATH = os.path.join("data", "scheduler.json")
+REQUEST_PATH = os.path.join("data", "schedule_request")
+
+MIN_INTERVAL = 10 * 60
+MAX_INTERVAL = 6 * 3600
+DEFAULT_INTERVAL = 3600
+# Poll interval = POLL_FACTOR x smoothed publish interval
+POLL_FACTOR = 1.0
+EWMA_ALPHA = 0.3
+# Newest dated entries used to estimate a feed's publish interval
+CADENCE_SAMPLE = 10
+SEEN_KEEP = 300
+
+# Seconds between two checks of the schedule (also the heartbeat period)
+TICK = 30
+# main.py treats the daemon as gone if its heartbeat is older than this
+ACTIVE_AFTER = 3 * TICK
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+# --- used by main.py (cheap, no curation imports) --- #
+def is_active():
+    heartbeat = _read_json(HEARTBEAT_PATH, {})
+    return time.time() - heartbeat.get("heartbeat", 0) < ACTIVE_AFTER
+
+def request_refresh():
+    os.makedirs(os.path.dirname(REQUEST_PATH), exist_ok=True)
+    with open(REQUEST_PATH, 'w', encoding='utf-8') as f:
+        f.write(str(time.time()))
+
+def _take_request():
+    try:
+        os.remove(REQUEST_PATH)
+        return True
+    except OSError:
+        return False
+
+# --- cadence --- #
+def _published_ts(entry, parse_date):
+    published = entry.get('published', entry.get('pubDate', entry.get('updated', entry.get('dc:date', entry.get('date', '')))))
+    return parse_date(published).timestamp() if published else None
+
+def update_cadence(record, entries, parse_date, now):
+    """
+    Folds the publish interval seen in entries into the feed's EWMA and schedules
+    its next poll. Returns the links that weren't seen before (see mark_seen).
+    """
+    links = [entry.get('link') or entry.get('url') or '' for entry in entries]
+    seen = set(record.get("seen", []))
+    new_links = [link for link in links if link and link not in seen]
+
+    stamps = sorted((ts for ts in (_published_ts(e, parse_date) for e in entries) if ts), reverse=True)[:CADENCE_SAMPLE]
+    if len(stamps) >= 2:
+        observed = (stamps[0] - stamps[-1]) / (len(stamps) - 1)
+        ewma = record.get("ewma")
+        record["ewma"] = observed if ewma is None else EWMA_ALPHA * observed + (1 - EWMA_ALPHA) * ewma
+
+    interval = min(MAX_INTERVAL, max(MIN_INTERVAL, record.get("ewma", DEFAULT_INTERVAL) * POLL_FACTOR))
+    record["interval"] = round(interval)
+    record["next_due"] = now + interval
+    record["last_fetch"] = now
+    if new_links:
+        record["last_change"] = now
+    return new_links
+
+def mark_seen(record, links):
+    record["seen"] = (links + [link for link in record.get("seen", []) if link not in links])[:SEEN_KEEP]
+
+# --- one pass --- #
+async def _fetch_due(due, fetch_entries):
+    from pipeline import run_blocking, within
+
+    async def fetch(url):
+        try:
+            return url, await within("feed", run_blocking(fetch_entries, url))
+        except Exception as e:
+            print(f"   [WARN] feed {url}: {e}")
+            return url, None
+
+    return await asyncio.gather(*[fetch(url) for url in due])
+
+async def _curate(categories, known, job):
+    from pipeline import start_budget
+    import generate_curation
+
+    start_budget()
+    results = await asyncio.gather(*[generate_curation.curate_category(cat, generate_curation.CATEGORIES[cat], known)
+                                     for cat in categories], return_exceptions=True)
+    results_by_cat = {}
+    for cat, res in zip(categories, results):
+        if isinstance(res, Exception):
+            print(f"   [ERROR] Category {cat} failed: {res}")
+            job.update(cat, "failed", str(res))
+        else:
+            print(f"   [DONE] {cat}: {len(res)} articles generated.")
+            job.update(cat, "done", len(res))
+            results_by_cat[cat] = res
+    return results_by_cat
+
+def run_pass(state, force=False):
+    """
+    Polls the due feeds and re-curates the categories they changed (force: every
+    feed is polled and every category re-curated).
+    Returns False if another curation run holds the refresh lock.
+    """
+    import feed_plan
+    import refresh_job
+    import metrics
+    import article_store
+    import snapshot_store
+    import generate_curation
+    from feed_cache import cached_feed
+    from translation import save_cache
+
+    def feed_urls_of(cat):
+        return {f["url"] for f in generate_curation.CATEGORIES[cat]}
+
+    now = time.time()
+    feeds = state.setdefault("feeds", {})
+    feed_urls = set().union(*[feed_urls_of(cat) for cat in generate_curation.CATEGORIES])
+    for url in set(feeds) - feed_urls:
+        # Removed from feeds.py (or an older state keyed by fetch URL)
+        del feeds[url]
+    due = sorted({feed_plan.ROUTES[url].fetch_url for url in feed_urls
+                  if force or feeds.get(url, {}).get("next_due", 0) <= now})
+    if not due:
+        return True
+
+    job = refresh_job.try_start()
+    if job is None:
+        return False
+    error = None
+    new_links = {}
+    republished = set()
+    try:
+        metrics.start_run()
+        for fetch_url in due:
+            feed_plan.expire(fetch_url)
+        for fetch_url, entries in asyncio.run(_fetch_due(due, feed_plan.fetch_entries)):
+            # Every configured feed served by this fetch got fresh entries
+            for url in (url for url in feed_urls if feed_plan.ROUTES[url].fetch_url == fetch_url):
+                record = feeds.setdefault(url, {})
+                if entries is None:
+                    # Failed or timed out: retry soon, cadence unchanged
+                    record["next_due"] = now + MIN_INTERVAL
+                    continue
+                route = feed_plan.ROUTES[url]
+                links = update_cadence(record, [e for e in entries if route.accepts(e)], generate_curation.parse_date, now)
+                if links:
+                    new_links[url] = links
+
+        categories = [cat for cat in generate_curation.CATEGORIES if force or feed_urls_of(cat) & set(new_links)]
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Polled {len(due)} feeds, {len(new_links)} changed -> re-curating {len(categories)} categories")
+
+        if categories:
+            # Feeds of those categories that weren't fetched now are served from the cache, no request
+            for fetch_url in {feed_plan.ROUTES[url].fetch_url for cat in categories for url in feed_urls_of(cat)} - set(due):
+                feed = cached_feed(fetch_url)
+                if feed is not None:
+                    feed_plan.prime(fetch_url, feed)
+            for cat in categories:
+                job.update(cat, "running", None)
+
+            store = article_store.load_store()
+            results_by_cat = asyncio.run(_curate(categories, store, job))
+            if results_by_cat:
+                _, previous = snapshot_store.load_current()
+                version = generate_curation.republish(previous, results_by_cat, sidecars=metrics.finish_run())
+                republished.update(results_by_cat)
+                for res in results_by_cat.values():
+                    article_store.remember(store, res)
+                article_store.save_store(store)
+                save_cache()
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Republished {', '.join(results_by_cat)} as snapshot v{version}.")
+    except Exception as e:
+        error = e
+        print(f"[ERROR] Scheduler pass failed: {e}")
+    finally:
+        # A feed's new links are seen once every category it feeds was republished;
+        # otherwise the feed is polled again soon and its categories retried
+        for url, links in new_links.items():
+            if all(cat in republished for cat in generate_curation.CATEGORIES if url in feed_urls_of(cat)):
+                mark_seen(feeds[url], links)
+            else:
+                feeds[url]["next_due"] = min(feeds[url]["next_due"], now + MIN_INTERVAL)
+        # Stops the profiler too when nothing was republished
+        metrics.finish_run()
+        job.finish(error)
+        _write_json(STATE_PATH, state)
+    return True
+
+def _beat(stop):
+    while True:
+        _write_json(HEARTBEAT_PATH, {"pid": os.getpid(), "heartbeat": time.time()})
+        if stop.wait(TICK):
+            return
+
+def run(once=False):
+    """
+    Runs the scheduler until interrupted (once=True: a single pass over the due feeds).
+    """
+    state = _read_json(STATE_PATH, {})
+    stop = threading.Event()
+    # Heartbeat from its own thread, so a long pass never looks like a dead daemon
+    threading.Thread(target=_beat, args=(stop,), daemon=True).start()
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Curation scheduler started (pid {os.getpid()}).")
+    try:
+        while True:
+            force = _take_request()
+            if not run_pass(state, force) and force:
+                # Someone else is curating right now; keep the request for the next tick
+                request_refresh()
+            if once:
+                break
+            next_due = min([f.get("next_due", 0) for f in state.get("feeds", {}).values()] or [0])
+            time.sleep(max(1, min(TICK, next_due - time.time())))
+    except KeyboardInterrupt:
+        print("Scheduler stopped.")
+    finally:
+        stop.set()
+        try:
+            os.remove(HEARTBEAT_PATH)
+        except OSError:
+            pass
+
+if __name__ == "__main__":
+    # python -m scheduler [schedule] [--once]
+    run(once="--once" in sys.argv)
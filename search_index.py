@@ -0,0 +1,47 @@
+import unicodedata
+
+# Precomputed search data for the client feed.
+# Every article gets a normalized `search_text`, and the snapshot ships an
+# inverted index keyed by article position (the snapshot order):
+# - grams: character bigram -> positions (substring search without a full scan)
+# - tags: tag -> positions (mute filtering)
+# - categories: category -> positions (tab filtering)
+INDEX_VERSION = 1
+
+def normalize(text):
+    # NFKC folds full-width / half-width variants; the client applies the same to queries
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+def search_text(article):
+    return normalize(" ".join([
+        article.get("title_ja", ""),
+        article.get("source", ""),
+        article.get("core_sentence", ""),
+        " ".join(article.get("tags", []))
+    ]))
+
+def bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def annotate(articles):
+    for article in articles:
+        article["search_text"] = search_text(article)
+    return articles
+
+def build_index(articles):
+    grams = {}
+    tags = {}
+    categories = {}
+    for pos, article in enumerate(articles):
+        text = article.get("search_text") or search_text(article)
+        for gram in bigrams(text):
+            grams.setdefault(gram, []).append(pos)
+        for tag in set(article.get("tags", [])):
+            tags.setdefault(tag, []).append(pos)
+        categories.setdefault(article.get("category", ""), []).append(pos)
+    return {
+        "version": INDEX_VERSION,
+        "grams": grams,
+        "tags": tags,
+        "categories": categories
+    }
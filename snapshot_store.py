@@ -0,0 +1,160 @@
+import json
+import os
+import re
+import sys
+import threading
+
+# Atomic, versioned store for the curated feed.
+# - every publish writes data/snapshots/v<version>.json via temp file + rename
+# - data/snapshots/CURRENT holds the current version id (cheap to check, no JSON parse)
+# - data/daily_curation.json is kept as an atomically replaced copy of the current version
+# - the last KEEP_VERSIONS complete runs are kept for instant rollback
+# - optional sidecars (e.g. the search index) live in v<version>.<name>.side.json
+SNAPSHOT_DIR = os.path.join("data", "snapshots")
+POINTER_PATH = os.path.join(SNAPSHOT_DIR, "CURRENT")
+LIVE_PATH = os.path.join("data", "daily_curation.json")
+KEEP_VERSIONS = 5
+
+_VERSION_RE = re.compile(r'^v(\d+)(\.partial)?\.json$')
+_lock = threading.Lock()
+
+def _atomic_write(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def _version_path(version, partial=False):
+    return os.path.join(SNAPSHOT_DIR, f"v{version:06d}{'.partial' if partial else ''}.json")
+
+def _sidecar_path(version, name):
+    return os.path.join(SNAPSHOT_DIR, f"v{version:06d}.{name}.side.json")
+
+def list_versions():
+    """
+    Returns [(version, is_partial, path)] sorted oldest first.
+    """
+    versions = []
+    try:
+        names = os.listdir(SNAPSHOT_DIR)
+    except FileNotFoundError:
+        return versions
+    for name in names:
+        match = _VERSION_RE.match(name)
+        if match:
+            versions.append((int(match.group(1)), bool(match.group(2)), os.path.join(SNAPSHOT_DIR, name)))
+    versions.sort()
+    return versions
+
+def current_version():
+    try:
+        with open(POINTER_PATH, 'r', encoding='utf-8') as f:
+            return int(f.read().strip() or 0)
+    except Exception:
+        return 0
+
+def current_mtime():
+    for path in (POINTER_PATH, LIVE_PATH):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            continue
+    return 0
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_version(version):
+    """
+    Returns the articles of a specific snapshot version (live file if it is gone).
+    """
+    for path in [p for v, _, p in list_versions() if v == version] + [LIVE_PATH]:
+        try:
+            return _read(path)
+        except Exception:
+            continue
+    return []
+
+def load_sidecar(version, name):
+    try:
+        return _read(_sidecar_path(version, name))
+    except Exception:
+        return None
+
+def load_current():
+    """
+    Returns (version, articles) for the current snapshot. Falls back to the live
+    file for trees that predate the versioned store.
+    """
+    version = current_version()
+    return version, load_version(version)
+
+def _point_to(version, path):
+    with open(path, 'rb') as f:
+        payload = f.read()
+    _atomic_write(LIVE_PATH, lambda f: f.write(payload.decode('utf-8')))
+    _atomic_write(POINTER_PATH, lambda f: f.write(str(version)))
+
+def _prune(current):
+    versions = list_versions()
+    complete = [v for v, partial, _ in versions if not partial]
+    keep = set(complete[-KEEP_VERSIONS:]) | {current}
+    for version, partial, path in versions:
+        # Partial snapshots only matter until something newer is published
+        if version in keep or (partial and version >= current):
+            continue
+        prefix = f"v{version:06d}."
+        for name in os.listdir(SNAPSHOT_DIR):
+            if name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(SNAPSHOT_DIR, name))
+                except OSError:
+                    pass
+
+def publish(articles, partial=False, sidecars=None):
+    """
+    Publishes a new snapshot version and makes it current. Returns the version id.
+    sidecars: optional {name: json-serializable} written alongside the version.
+    """
+    with _lock:
+        existing = list_versions()
+        version = max([v for v, _, _ in existing] + [current_version()]) + 1
+        # Sidecars first, so a reader that sees the new version also finds them
+        for name, data in (sidecars or {}).items():
+            _atomic_write(_sidecar_path(version, name), lambda f, data=data: json.dump(data, f, ensure_ascii=False))
+        path = _version_path(version, partial)
+        _atomic_write(path, lambda f: json.dump(articles, f, ensure_ascii=False, indent=4))
+        _point_to(version, path)
+        _prune(version)
+        return version
+
+def rollback(version=None):
+    """
+    Makes an older complete snapshot current again (default: the one before current).
+    """
+    with _lock:
+        current = current_version()
+        candidates = [(v, p) for v, partial, p in list_versions() if not partial and v != current]
+        if version is not None:
+            candidates = [(v, p) for v, p in candidates if v == version]
+        else:
+            candidates = [(v, p) for v, p in candidates if v < current]
+        if not candidates:
+            raise ValueError("No snapshot version available to roll back to")
+        target, path = candidates[-1]
+        _point_to(target, path)
+        return target
+
+if __name__ == "__main__":
+    # python snapshot_store.py [list | rollback [version]]
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "rollback":
+        target = rollback(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        print(f"Current snapshot is now v{target}")
+    else:
+        current = current_version()
+        for version, partial, path in list_versions():
+            marker = "*" if version == current else " "
+            print(f"{marker} v{version}{' (partial)' if partial else ''}  {path}")
@@ -0,0 +1,111 @@
+from lazy_deps import lazy
+from nlp_engine import get_engine
+
+np = lazy("numpy")
+
+# Built-in Lead-1 + LSA summarizer (replaces sumy's LsaSummarizer per article).
+# - sentence / word segmentation follows sumy's PlaintextParser with the engine's
+#   sumy Tokenizer, so both paths see exactly the same sentences
+# - the documents of a batch share one vocabulary and one tokenizing pass; each
+#   document then gets a word x sentence TF matrix (sumy's smoothed max-TF)
+# - no full SVD: with all dimensions the LSA rank has a closed form, and a
+#   truncated LSA_DIMENSIONS ranking eigendecomposes the small sentence x sentence
+#   Gram matrix (A^T A = V S^2 V^T); documents are capped at MAX_SENTENCES sentences
+# `python benchmarks/bench_summarizer.py` compares the output and CPU cost with sumy.
+MAX_SENTENCES = 200
+# None keeps every dimension (same ranking as sumy); a number keeps only the top topics
+LSA_DIMENSIONS = None
+TF_SMOOTH = 0.4
+
+def split_sentences(text, tokenizer):
+    """
+    Returns (sentences, heading_words) the way sumy's PlaintextParser builds a document:
+    upper-case lines are headings (not sentences, but their words join the dictionary)
+    and the other lines between headings / blank lines are joined and sentence-tokenized.
+    """
+    sentences = []
+    heading_words = []
+    run = []
+    for line in text.strip().splitlines():
+        line = line.strip()
+        if line.isupper() or not line:
+            # Headings and blank lines (paragraph breaks) end the current run of text
+            if run:
+                sentences.extend(tokenizer.to_sentences(" ".join(run)))
+                run = []
+            if line:
+                heading_words.extend(tokenizer.to_words(line))
+        else:
+            run.append(line)
+    if run:
+        sentences.extend(tokenizer.to_sentences(" ".join(run)))
+    return sentences, heading_words
+
+def lsa_ranks(counts, dimensions=None):
+    """
+    counts: word x sentence occurrence matrix. Returns one LSA rank per sentence.
+    """
+    max_counts = counts.max(axis=0)
+    filled = max_counts > 0
+    tf = np.zeros_like(counts)
+    tf[:, filled] = TF_SMOOTH + (1.0 - TF_SMOOTH) * counts[:, filled] / max_counts[filled]
+
+    if not dimensions or dimensions >= tf.shape[1]:
+        # Every dimension kept (sumy's REDUCTION_RATIO = 1): sqrt(sum_i s_i^2 v_ij^2) is
+        # exactly the norm of sentence column j, no decomposition needed
+        ranks = np.sqrt((tf ** 2).sum(axis=0))
+    else:
+        # Eigenpairs of the Gram matrix are the squared singular values / right singular vectors
+        eigenvalues, eigenvectors = np.linalg.eigh(tf.T @ tf)
+        k = max(3, dimensions)
+        powered_sigma = np.clip(eigenvalues[-k:], 0.0, None)
+        ranks = np.sqrt((eigenvectors[:, -k:] ** 2 * powered_sigma).sum(axis=1))
+    # Rounded so that equal ranks tie exactly and fall back to document order
+    return np.round(ranks, 9)
+
+def summarize_batch(docs, sentences_count=3):
+    """
+    docs: [(text, lang)]. Returns one list of summary sentences per document
+    (the lead sentence first, then LSA picks, in document order); [] when a
+    document has no sentence.
+    """
+    engine = get_engine()
+    vocabulary = {}
+    parsed = []
+    for text, lang in docs:
+        tokenizer = engine.tokenizer(lang)
+        sentences, heading_words = split_sentences(text, tokenizer)
+        word_ids = []
+        sentence_ids = []
+        for col, sentence in enumerate(sentences[:MAX_SENTENCES]):
+            for word in engine.sentence_words(sentence, lang):
+                word_ids.append(vocabulary.setdefault(word.lower(), len(vocabulary)))
+                sentence_ids.append(col)
+        extra_ids = [vocabulary.setdefault(word.lower(), len(vocabulary)) for word in heading_words]
+        parsed.append((sentences, word_ids, sentence_ids, extra_ids))
+
+    summaries = []
+    for sentences, word_ids, sentence_ids, extra_ids in parsed:
+        if not sentences:
+            summaries.append([])
+            continue
+
+        candidates = []
+        rows, row_index = np.unique(np.array(word_ids + extra_ids, dtype=np.int64), return_inverse=True)
+        if len(rows):
+            n_sentences = min(len(sentences), MAX_SENTENCES)
+            counts = np.zeros((len(rows), n_sentences))
+            np.add.at(counts, (row_index[:len(word_ids)], np.array(sentence_ids, dtype=np.int64)), 1.0)
+            ranks = lsa_ranks(counts, LSA_DIMENSIONS)
+            # Best ranked first (stable for ties, like sumy), then back to document order
+            best = sorted(np.argsort(-ranks, kind="stable")[:sentences_count])
+            candidates = [sentences[i] for i in best]
+
+        # Always include the Lead (first) sentence, then fill the rest with LSA
+        first_sentence = sentences[0]
+        final_sentences = [first_sentence]
+        for s in candidates:
+            if s != first_sentence and len(final_sentences) < sentences_count:
+                final_sentences.append(s)
+        summaries.append(final_sentences)
+    return summaries
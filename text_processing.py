@@ -0,0 +1,107 @@
+import re
+from functools import cached_property, lru_cache
+from lazy_deps import lazy
+from nlp_engine import get_engine
+
+bs4 = lazy("bs4")
+
+# Text processing shared by both curation entry points (through cpu_stages):
+# - clean(): one pass over the extracted lines with a single compiled noise matcher
+# - CleanText caches its language and lead sentence, so every stage reuses them
+# - lead_sentence(): sentence-tokenizes only a growing prefix, not the whole article
+# - strip_html(): skips BeautifulSoup when the summary has no markup
+NOISE_WORDS = ['cookie', 'subscribe', 'log in', 'sign in', 'sign up', 'newsletter', 'read more', 'javascript', 'please enable']
+NOISE_RE = re.compile("|".join(re.escape(w) for w in NOISE_WORDS), re.IGNORECASE)
+MIN_LINE_LENGTH = 15
+
+# Share of ASCII characters in the first LANG_SAMPLE chars above which text is English
+LANG_SAMPLE = 500
+ENGLISH_RATIO = 0.8
+
+# Characters handed to the sentence tokenizer first when looking for the lead sentence
+LEAD_WINDOW = 600
+
+# Japanese reading speed, for the read-time estimate
+CHARS_PER_MINUTE = 400
+
+def ascii_ratio(text):
+    # encode() drops the non-ASCII characters in C instead of a Python-level loop
+    return len(text.encode('ascii', 'ignore')) / len(text) if text else 0.0
+
+@lru_cache(maxsize=4096)
+def is_english(text):
+    """
+    Language heuristic for short strings (titles, lead sentences, tags); cached.
+    """
+    return ascii_ratio(text[:LANG_SAMPLE]) > ENGLISH_RATIO
+
+def starts_ascii(text):
+    return bool(text) and ord(text[0]) < 128
+
+class CleanText:
+    def __init__(self, lines):
+        self.lines = lines
+        self.text = '\n'.join(lines)
+
+    def __bool__(self):
+        return bool(self.lines)
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def is_english(self):
+        return ascii_ratio(self.text[:LANG_SAMPLE]) > ENGLISH_RATIO
+
+    @property
+    def lang(self):
+        return "english" if self.is_english else "japanese"
+
+    @property
+    def read_time(self):
+        return max(1, round(len(self.text) / CHARS_PER_MINUTE))
+
+    @cached_property
+    def lead_sentence(self):
+        return lead_sentence(self.lines)
+
+def clean(text):
+    """
+    Keeps stripped lines longer than MIN_LINE_LENGTH without noise words
+    (very short lines are usually UI text), in one pass.
+    """
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if len(line) > MIN_LINE_LENGTH and not NOISE_RE.search(line):
+            lines.append(line)
+    return CleanText(lines)
+
+def lead_sentence(lines, window=LEAD_WINDOW):
+    """
+    First sentence of the text formed by the lines. Only a prefix is tokenized:
+    once it holds a second sentence (or is the whole text) the first one is final.
+    """
+    tokenize = get_engine().sent_tokenize
+    total = sum(len(line) + 1 for line in lines) - 1
+    while True:
+        prefix = []
+        size = 0
+        for line in lines:
+            prefix.append(line)
+            size += len(line) + 1
+            if size > window:
+                break
+        sentences = tokenize(' '.join(prefix))
+        if not sentences:
+            return None
+        if len(sentences) > 1 or size - 1 >= total:
+            return sentences[0]
+        window *= 2
+
+def strip_html(html):
+    if not html:
+        return ''
+    if '<' not in html and '&' not in html:
+        return html.strip()
+    return bs4.BeautifulSoup(html, "html.parser").get_text(separator=' ', strip=True)
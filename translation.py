@@ -0,0 +1,303 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from lazy_deps import lazy
+import metrics
+
+deep_translator = lazy("deep_translator")
+
+# Shared translation layer used by both curation entry points.
+# - persistent cache keyed by (target language, source text)
+# - LRU eviction once MAX_ENTRIES is exceeded
+# - single-flight: concurrent requests for the same string share one network call
+# - pluggable backends (AINEWS_TRANSLATOR): "google" (deep_translator's GoogleTranslator)
+#   or "standin" (local, no network; benchmarks and offline runs)
+# - translate_many(): the cache misses of a whole batch are packed one per line into
+#   as few requests as possible and split back (one request per string if the
+#   service merges lines)
+# - every request takes a token from a bucket (AINEWS_TRANSLATE_RATE requests/s) and
+#   failed requests are retried with exponential backoff
+CACHE_PATH = os.path.join("data", "translation_cache.json")
+MAX_ENTRIES = 5000
+
+BACKEND = os.environ.get("AINEWS_TRANSLATOR", "google")
+RATE = float(os.environ.get("AINEWS_TRANSLATE_RATE", "5"))
+BURST = 10
+RETRIES = 2
+BACKOFF = 0.5
+
+# Google's web endpoint rejects requests above 5000 characters
+MAX_BATCH_CHARS = 4500
+MAX_BATCH_ITEMS = 50
+
+# Longest wait for a string another thread is already translating (a hung request
+# must not hang every later caller of the same string)
+SHARED_WAIT = 60
+
+_lock = threading.Lock()
+_cache = None
+_in_flight = {}
+_dirty = False
+_backend = None
+
+class GoogleBackend:
+    def __init__(self):
+        # GoogleTranslator keeps per-request state, so each thread reuses its own instance.
+        # Its requests.get has no timeout: a hung call holds one of the translation
+        # threads (pipeline.run_translation), never the feed / download threads.
+        self._local = threading.local()
+
+    def translate(self, text, target):
+        translators = getattr(self._local, "by_target", None)
+        if translators is None:
+            translators = self._local.by_target = {}
+        translator = translators.get(target)
+        if translator is None:
+            translator = translators[target] = deep_translator.GoogleTranslator(source='auto', target=target)
+        return translator.translate(text)
+
+class StandinBackend:
+    """
+    Local stand-in: one simulated round-trip (latency, failure rate) per request.
+    Each line comes back with a non-ASCII prefix, like a real Japanese translation,
+    so the engine's language checks take the same branches.
+    """
+    def __init__(self, latency=0.15, jitter=0.05, failure_rate=0.0, seed=7):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self.chars = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate(self, text, target):
+        with self._lock:
+            self.calls += 1
+            self.chars += len(text)
+            fail = self._rng.random() < self.failure_rate
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            if fail:
+                self.failures += 1
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("stand-in translator failure")
+        return "\n".join(f"（{target}）{line}" for line in text.split("\n"))
+
+    def as_dict(self):
+        with self._lock:
+            return {"calls": self.calls, "failures": self.failures, "chars": self.chars}
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "standin": StandinBackend,
+}
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now; a negative balance is the queue in front of us
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+_bucket = TokenBucket(RATE, BURST)
+
+def get_backend():
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = BACKENDS[BACKEND]()
+        return _backend
+
+def set_backend(backend):
+    """
+    Routes translations through backend (an object with translate(text, target));
+    None restores the AINEWS_TRANSLATOR default.
+    """
+    global _backend
+    with _lock:
+        _backend = backend
+
+def _key(text, target):
+    return f"{target}\x00{text}"
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = OrderedDict()
+        try:
+            with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+                for k, v in json.load(f).items():
+                    _cache[k] = v
+        except Exception:
+            pass
+    return _cache
+
+def _request(text, target):
+    """
+    One backend round-trip, rate limited and retried with exponential backoff.
+    """
+    backend = get_backend()
+    for attempt in range(RETRIES + 1):
+        _bucket.acquire()
+        start = time.perf_counter()
+        try:
+            return backend.translate(text, target)
+        except Exception:
+            metrics.count("translation.failures")
+            if attempt == RETRIES:
+                raise
+            metrics.count("translation.retries")
+            time.sleep(BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+        finally:
+            metrics.observe("translation.call", time.perf_counter() - start)
+
+def _batches(texts):
+    batch = []
+    size = 0
+    for text in texts:
+        if batch and (size + len(text) + 1 > MAX_BATCH_CHARS or len(batch) >= MAX_BATCH_ITEMS):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+def _translate_batch(texts, target):
+    """
+    Returns one translation (or the exception) per text.
+    """
+    if len(texts) > 1:
+        # One string per line; the service keeps line breaks, so the result splits back
+        packed = "\n".join(" ".join(text.split()) for text in texts)
+        try:
+            lines = [line.strip() for line in (_request(packed, target) or "").split("\n") if line.strip()]
+            if len(lines) == len(texts):
+                metrics.count("translation.packed", len(texts))
+                return lines
+            metrics.count("translation.unpacked")
+        except Exception as e:
+            return [e] * len(texts)
+
+    results = []
+    for text in texts:
+        try:
+            results.append(_request(text, target))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def _translate_all(texts, target):
+    """
+    {text: translation or exception} for the non-blank texts, from the cache where
+    possible; the misses this call owns go out in packed batches.
+    """
+    global _dirty
+    results = {}
+    owned = []
+    waiting = []
+    with _lock:
+        cache = _load_cache()
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                continue
+            key = _key(text, target)
+            if key in cache:
+                cache.move_to_end(key)
+                metrics.count("translation.cache_hit")
+                results[text] = cache[key]
+                continue
+            future = _in_flight.get(key)
+            if future is None:
+                future = _in_flight[key] = Future()
+                owned.append((text, future))
+            else:
+                waiting.append((text, future))
+
+    metrics.count("translation.cache_miss", len(owned))
+    for batch in _batches([text for text, _ in owned]):
+        translations = _translate_batch(batch, target)
+        with _lock:
+            for text, result in zip(batch, translations):
+                key = _key(text, target)
+                # Failures are never cached
+                if result and not isinstance(result, Exception):
+                    cache[key] = result
+                    cache.move_to_end(key)
+                    _dirty = True
+                _in_flight.pop(key, None)
+            while len(cache) > MAX_ENTRIES:
+                cache.popitem(last=False)
+        for text, result in zip(batch, translations):
+            results[text] = result
+    for text, future in owned:
+        result = results[text]
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+    # Someone else is already translating these exact strings; wait for their results
+    for text, future in waiting:
+        metrics.count("translation.shared")
+        try:
+            results[text] = future.result(timeout=SHARED_WAIT)
+        except Exception as e:
+            results[text] = e
+    return results
+
+def translate(text, target='ja'):
+    """
+    Translates text, served from the cache when possible.
+    Raises on failure (failures are never cached) so callers keep their fallbacks.
+    """
+    if not text or not text.strip():
+        return text
+    result = _translate_all([text], target)[text]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def translate_many(texts, target='ja'):
+    """
+    Translates many strings with as few requests as possible.
+    Returns {text: translation} for the strings that succeeded; callers fall back
+    to the original text for the rest.
+    """
+    return {text: result for text, result in _translate_all(texts, target).items()
+            if result and not isinstance(result, Exception)}
+
+def save_cache():
+    global _dirty
+    with _lock:
+        if _cache is None or not _dirty:
+            return
+        snapshot = dict(_cache)
+        _dirty = False
+
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    tmp_path = CACHE_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_PATH)